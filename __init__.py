@@ -37,18 +37,36 @@ bl_info = {
 # ------------------------------------------------------------------------------
 #    IMPORTS
 # ------------------------------------------------------------------------------
+import time
+_t_import = time.perf_counter()
+if "bpy" in locals():
+    # Reload Scripts (F8/F3) during development: reload the add-on modules 
+    # already loaded, in dependency order, before they are re-imported
+    import importlib
+    import sys
+    for _name in ('profiles', 'geometry', 'validate', 'sources', 'status', 
+                    'preview', 'memory', 'profiling', 'ui', 'ops'):
+        _module = sys.modules.get(f'{__name__}.{_name}')
+        if _module is not None:
+            importlib.reload(_module)
 import bpy
 from . import ui 
 from . import ops
+from . import sources
+# startup cost in seconds, reported by the farm benchmark
+timings = {'import': time.perf_counter() - _t_import, 'register': 0.0}
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
 #    REGISTER/UNREGISTER
 # ------------------------------------------------------------------------------
 def register():
+    t = time.perf_counter()
     ui.register()
     ops.register()
+    timings['register'] = time.perf_counter() - t
 
 def unregister():
+    sources.unregister()
     ui.unregister()
     ops.unregister()
\ No newline at end of file
@@ -0,0 +1,264 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+"""MCutter batch cutting farm.
+
+Driver (plain Python):
+
+    python farm.py jobs.json --blender /path/to/blender --workers 8
+
+Shards the job list across N headless Blender processes, each running this
+same script in worker mode, and merges their results into a single report.
+
+Job file: a JSON list (or {"jobs": [...]}) of entries like
+
+    {"blend": "assets/panel.blend", "source": "Panel",
+     "output": "out/panel_cut.blend",
+     "remove_modifiers": true, "apply_scale": true,
+     "cutters": [{"cutter_profile": "Rectangle", "cutter_size": [1, 0.2, 1],
+                  "arr_coll": [{"count": 3, "offset": [0, 0, 0.5]}]}]}
+
+Cutter entries use the Update operator property names; anything not given
+keeps the add-on defaults (or the previous cutter's settings).
+"""
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    SHARED FUNCTIONS
+# ------------------------------------------------------------------------------
+def jobs_load(path):
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('jobs', [])
+    return data
+
+def jobs_shard(jobs, n):
+    # every job reopens its .blend file, so jobs are spread one by one, 
+    # largest first, onto the least loaded worker (cost: cutter count)
+    shards = [[] for i in range(n)]
+    loads = [0] * n
+    for idx, job in sorted(enumerate(jobs), key = lambda e: -job_cost(e[1])):
+        i = loads.index(min(loads))
+        shards[i].append((idx, job))
+        loads[i] += job_cost(job)
+    return [s for s in shards if s]
+
+def job_cost(job):
+    return 1 + len(job.get('cutters', ()))
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    DRIVER
+# ------------------------------------------------------------------------------
+def driver(args):
+    jobs = jobs_load(args.jobs)
+    if not jobs:
+        print('mcutter farm: no jobs')
+        return 1
+    workers = max(1, min(args.workers, len(jobs)))
+    shards = jobs_shard(jobs, workers)
+    tmp_dir = tempfile.mkdtemp(prefix = 'mcutter_farm_')
+    log_dir = os.path.dirname(os.path.abspath(args.report))
+    procs = []
+    t_start = time.perf_counter()
+    for i, shard in enumerate(shards):
+        shard_path = os.path.join(tmp_dir, f'shard_{i}.json')
+        result_path = os.path.join(tmp_dir, f'result_{i}.json')
+        with open(shard_path, 'w') as f:
+            json.dump([{'index': idx, 'job': job} for idx, job in shard], f)
+        cmd = [args.blender, '--background', '--factory-startup',
+                '--python', os.path.abspath(__file__), '--',
+                '--worker', shard_path, result_path]
+        log = open(os.path.join(log_dir,
+                    f'{os.path.basename(args.report)}.w{i}.log'), 'w')
+        procs.append((i, shard, result_path, log,
+                    subprocess.Popen(cmd, stdout = log,
+                                    stderr = subprocess.STDOUT)))
+    results = []
+    for i, shard, result_path, log, proc in procs:
+        code = proc.wait()
+        log.close()
+        shard_results = []
+        if os.path.exists(result_path):
+            with open(result_path) as f:
+                shard_results = json.load(f)
+        done = {r['index'] for r in shard_results}
+        for idx, job in shard:
+            if idx not in done:
+                shard_results.append({
+                    'index': idx, 'worker': i, 'ok': False,
+                    'source': job.get('source', ''),
+                    'blend': job.get('blend', ''),
+                    'error': f'worker exited with code {code}',
+                    'timings': {}
+                    })
+        results.extend(shard_results)
+    wall = time.perf_counter() - t_start
+    results.sort(key = lambda r: r['index'])
+    report = report_build(results, wall, len(shards))
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent = 2)
+    report_print(report)
+    return 0 if report['failed'] == 0 else 2
+
+def report_build(results, wall, workers):
+    busy = sum(r['timings'].get('total', 0.0) for r in results)
+    failed = [r for r in results if not r['ok']]
+    # add-on import/register time, once per worker process
+    startup = {r['worker']: r['startup'] for r in results if r.get('startup')}
+    return {
+        'jobs': len(results),
+        'failed': len(failed),
+        'workers': workers,
+        'wall_time': wall,
+        'busy_time': busy,
+        'jobs_per_second': len(results) / wall if wall > 0 else 0.0,
+        'speedup': busy / wall if wall > 0 else 0.0,
+        'startup_import': max((s['import'] for s in startup.values()),
+                                default = 0.0),
+        'startup_register': max((s['register'] for s in startup.values()),
+                                default = 0.0),
+        'results': results
+        }
+
+def report_print(report):
+    print(f"mcutter farm: {report['jobs']} jobs, {report['failed']} failed, "
+            f"{report['workers']} workers")
+    print(f"  wall {report['wall_time']:.2f}s  busy {report['busy_time']:.2f}s"
+            f"  speedup x{report['speedup']:.2f}  "
+            f"{report['jobs_per_second']:.2f} jobs/s")
+    print(f"  add-on import {report['startup_import'] * 1000:.1f}ms"
+            f"  register {report['startup_register'] * 1000:.1f}ms")
+    for r in report['results']:
+        if not r['ok']:
+            print(f"  FAILED [{r['index']}] {r['source']}: "
+                    f"{r['error'].strip().splitlines()[-1]}")
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    WORKER [ runs inside headless Blender ]
+# ------------------------------------------------------------------------------
+def worker(shard_path, result_path):
+    import importlib
+    pkg_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(pkg_dir))
+    addon = importlib.import_module(os.path.basename(pkg_dir))
+    addon.register()
+    startup = dict(addon.timings)
+    with open(shard_path) as f:
+        shard = json.load(f)
+    worker_id = int(os.path.basename(shard_path).split('_')[-1].split('.')[0])
+    results = []
+    for entry in shard:
+        job = entry['job']
+        result = {'index': entry['index'], 'worker': worker_id, 'ok': True,
+                'source': job.get('source', ''),
+                'blend': job.get('blend', ''), 'error': '', 'timings': {},
+                'startup': startup}
+        t_job = time.perf_counter()
+        try:
+            worker_job_run(addon, job, result['timings'])
+        except Exception:
+            result['ok'] = False
+            result['error'] = traceback.format_exc()
+        result['timings']['total'] = time.perf_counter() - t_job
+        results.append(result)
+        # results are rewritten after every job: a crash keeps what is done
+        with open(result_path, 'w') as f:
+            json.dump(results, f)
+
+def worker_job_run(addon, job, timings):
+    import bpy
+    t = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath = job['blend'])
+    timings['open'] = time.perf_counter() - t
+    scene = bpy.context.scene
+    props = scene.ptmc_props
+    source = scene.objects.get(job['source'])
+    if source is None:
+        raise LookupError(f"source object '{job['source']}' not found")
+    bpy.context.view_layer.objects.active = source
+    props.target_old_mods_remove = job.get('remove_modifiers', True)
+    props.target_apply_scale = job.get('apply_scale', True)
+    t = time.perf_counter()
+    if bpy.ops.mcutter.target_set() != {'FINISHED'}:
+        raise RuntimeError('target_set failed')
+    timings['target_set'] = time.perf_counter() - t
+    t = time.perf_counter()
+    for i, spec in enumerate(job.get('cutters', ())):
+        if i > 0:
+            bpy.ops.mcutter.add_item()
+        session = props.sessions[props.session_idx]
+        params = addon.ops.update_params(session, 
+                                        session.ul_coll[session.ul_idx])
+        params.update(spec)
+        if 'arr_coll' in spec:
+            params['arr_coll'] = [dict(params_arr, name = f'Array_{j + 1}')
+                                for j, params_arr in enumerate(spec['arr_coll'])]
+        if bpy.ops.mcutter.update('EXEC_DEFAULT', **params) != {'FINISHED'}:
+            raise RuntimeError(f'update failed on cutter {i + 1}')
+    timings['cutters'] = time.perf_counter() - t
+    t = time.perf_counter()
+    if bpy.ops.mcutter.finalize('EXEC_DEFAULT') != {'FINISHED'}:
+        raise RuntimeError('finalize failed')
+    timings['finalize'] = time.perf_counter() - t
+    output = job.get('output')
+    if output:
+        t = time.perf_counter()
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok = True)
+        bpy.ops.wm.save_as_mainfile(filepath = output, copy = True)
+        timings['save'] = time.perf_counter() - t
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    MAIN
+# ------------------------------------------------------------------------------
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else \
+            sys.argv[1:]
+    if argv and argv[0] == '--worker':
+        worker(argv[1], argv[2])
+        return 0
+    parser = argparse.ArgumentParser(description = 'MCutter batch farm')
+    parser.add_argument('jobs', help = 'job list (.json)')
+    parser.add_argument('--blender', default = 'blender',
+                        help = 'Blender executable')
+    parser.add_argument('--workers', '-j', type = int,
+                        default = os.cpu_count() or 1,
+                        help = 'number of Blender processes')
+    parser.add_argument('--report', default = 'mcutter_farm_report.json',
+                        help = 'report file (.json)')
+    return driver(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import math
+from functools import lru_cache
+import numpy as np
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    GEOMETRY KERNELS [ shell = (coords, [faces block (n, verts per face)]) ]
+# ------------------------------------------------------------------------------
+def rotation(axis, angle):
+    # (n, 3, 3) rotation matrices about a unit axis, one per angle
+    k = np.asarray(axis, dtype = np.float64)
+    a = np.atleast_1d(np.asarray(angle, dtype = np.float64))
+    c = np.cos(a)[:, None, None]
+    s = np.sin(a)[:, None, None]
+    kx = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+    return c * np.eye(3) + s * kx + (1 - c) * np.outer(k, k)
+
+def grid_faces(rows, cols, wrap_rows, wrap_cols, col_major = False):
+    # quads (r c, r c+1, r+1 c+1, r+1 c) of a rows x cols vertex grid
+    r0, c0 = np.meshgrid(np.arange(rows if wrap_rows else rows - 1), 
+                        np.arange(cols if wrap_cols else cols - 1), 
+                        indexing = 'ij')
+    r1 = (r0 + 1) % rows
+    c1 = (c0 + 1) % cols
+    sr, sc = (1, rows) if col_major else (cols, 1)
+    return np.stack((r0 * sr + c0 * sc, r0 * sr + c1 * sc, 
+                    r1 * sr + c1 * sc, r1 * sr + c0 * sc), 
+                    axis = -1).reshape(-1, 4)
+
+def signed_area(outline):
+    x, z = outline[:, 0], outline[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(z, -1)) - np.dot(np.roll(x, -1), z))
+
+def faces_flip(blocks):
+    return [b[:, ::-1] for b in blocks]
+
+def prism(outline, ry, flip = False):
+    # closed (x, z) outline extruded from -ry to ry
+    n = len(outline)
+    co = np.empty((2, n, 3))
+    co[:, :, 0] = outline[:, 0]
+    co[0, :, 1] = -ry
+    co[1, :, 1] = ry
+    co[:, :, 2] = outline[:, 1]
+    blocks = [grid_faces(n, 2, True, False, col_major = True), 
+                np.arange(n)[None, :], np.arange(2 * n - 1, n - 1, -1)[None, :]]
+    return co.reshape(-1, 3), faces_flip(blocks) if flip else blocks
+
+def sweep(path, axis_z, ring, closed, flip = False):
+    # ring (y, z) swept along an (x, z) path, ring z along axis_z; 
+    # ring (m, 2) is shared by every path point, (n, m, 2) is per point
+    n, m = len(path), ring.shape[-2]
+    ring = np.broadcast_to(ring, (n, m, 2))
+    co = np.empty((n, m, 3))
+    co[:, :, 0] = path[:, None, 0] + ring[:, :, 1] * axis_z[:, None, 0]
+    co[:, :, 1] = ring[:, :, 0]
+    co[:, :, 2] = path[:, None, 1] + ring[:, :, 1] * axis_z[:, None, 1]
+    blocks = [grid_faces(n, m, closed, True)]
+    if not closed:
+        blocks = [np.arange(m)[None, ::-1], 
+                    np.arange((n - 1) * m, n * m)[None, :]] + blocks
+    return co.reshape(-1, 3), faces_flip(blocks) if flip else blocks
+
+def ring_flat(ry, f):
+    return np.array(((ry, -f), (ry, f), (-ry, f), (-ry, -f)))
+
+def ring_round(ry, f, res):
+    a = np.arange(res) * (2 * math.pi / res)
+    return np.stack((ry * np.cos(a), f * np.sin(a)), axis = -1)
+
+@lru_cache(maxsize = 32)
+def noise_grid(seed, rows, cols, scale, octaves):
+    # fractal gradient noise on a rows x cols grid, periodic on both axes
+    # (closed outline x ring); read-only, shared by the cache
+    u = np.arange(rows) / rows
+    v = np.arange(cols) / cols
+    total = np.zeros((rows, cols))
+    amp_sum = 0.0
+    for k in range(octaves):
+        period = max(1, int(round(scale))) * 2 ** k
+        rng = np.random.default_rng(seed * 16 + k)
+        ang = rng.uniform(0.0, 2 * math.pi, (period, period))
+        grad = np.stack((np.cos(ang), np.sin(ang)), axis = -1)
+        x = u * period
+        y = v * period
+        i0 = np.floor(x).astype(np.int64)
+        j0 = np.floor(y).astype(np.int64)
+        fx = (x - i0)[:, None]
+        fy = (y - j0)[None, :]
+        i0, i1 = i0[:, None] % period, (i0[:, None] + 1) % period
+        j0, j1 = j0[None, :] % period, (j0[None, :] + 1) % period
+        n00 = grad[i0, j0, 0] * fx + grad[i0, j0, 1] * fy
+        n10 = grad[i1, j0, 0] * (fx - 1) + grad[i1, j0, 1] * fy
+        n01 = grad[i0, j1, 0] * fx + grad[i0, j1, 1] * (fy - 1)
+        n11 = grad[i1, j1, 0] * (fx - 1) + grad[i1, j1, 1] * (fy - 1)
+        sx = fx * fx * fx * (fx * (fx * 6 - 15) + 10)
+        sy = fy * fy * fy * (fy * (fy * 6 - 15) + 10)
+        nx0 = n00 + sx * (n10 - n00)
+        nx1 = n01 + sx * (n11 - n01)
+        w = 0.5 ** k
+        total += w * (nx0 + sy * (nx1 - nx0))
+        amp_sum += w
+    total /= amp_sum
+    total.setflags(write = False)
+    return total
+
+def shells_transform(shells, rot, loc):
+    return [(co @ rot.T + loc, blocks) for co, blocks in shells]
+
+def shells_join(shells):
+    # -> coords (n, 3), loops, loop totals
+    co, loops, totals = [], [], []
+    offset = 0
+    for c, blocks in shells:
+        for b in blocks:
+            loops.append((b + offset).ravel())
+            totals.append(np.full(len(b), b.shape[1]))
+        co.append(c)
+        offset += len(c)
+    return (np.concatenate(co), np.concatenate(loops).astype(np.int32), 
+            np.concatenate(totals).astype(np.int32))
+
+def radial_transforms(axis, angle, steps, radius, offset, symm):
+    i = np.arange(steps)
+    a = i * angle
+    if symm:
+        dv = np.where(i % 2, -offset, offset)
+    else:
+        dv = offset * i
+    c, s = radius * np.cos(a), radius * np.sin(a)
+    if axis == 'X':
+        loc = np.stack((dv, c, s), axis = -1)
+        rot = rotation((1, 0, 0), a)
+    elif axis == 'Y':
+        loc = np.stack((c, dv, s), axis = -1)
+        rot = rotation((0, -1, 0), a)
+    else:
+        loc = np.stack((c, s, dv), axis = -1)
+        rot = rotation((0, 0, 1), a)
+    return rot, loc
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    PROFILE OUTLINES [ closed (x, z) loop + frame direction per point ]
+# ------------------------------------------------------------------------------
+def radii_get(p):
+    return [p.cutter_size[i] / 2 for i in range(3)]
+
+def rectangle_outline(p):
+    rx, ry, rz = radii_get(p)
+    d = np.array(((1, -1), (1, 1), (-1, 1), (-1, -1)), dtype = np.float64)
+    return d * (rx, rz), d
+
+def ellipse_outline(p):
+    rx, ry, rz = radii_get(p)
+    a = np.arange(p.cutter_res) * (2 * math.pi / p.cutter_res)
+    d = np.stack((np.cos(a), np.sin(a)), axis = -1)
+    return d * (rx, rz), d
+
+def star_outline(p):
+    rx, ry, rz = radii_get(p)
+    n = p.cutter_res
+    a = np.arange(2 * n) * (math.pi / n)
+    d = np.stack((np.cos(a), np.sin(a)), axis = -1)
+    k = np.where(np.arange(2 * n) % 2, p.star_ratio, 1.0)[:, None]
+    return d * k * (rx, rz), d
+
+def outline_normals(outline):
+    # outward vertex normals of a closed (x, z) loop, either winding
+    t = np.roll(outline, -1, axis = 0) - np.roll(outline, 1, axis = 0)
+    n = np.stack((t[:, 1], -t[:, 0]), axis = -1)
+    n /= np.maximum(np.linalg.norm(n, axis = 1), 1e-12)[:, None]
+    return n if signed_area(outline) >= 0 else -n
+
+def noise_outline(p):
+    rx, ry, rz = radii_get(p)
+    n = p.cutter_res
+    a = np.arange(n) * (2 * math.pi / n)
+    d = np.stack((np.cos(a), np.sin(a)), axis = -1)
+    disp = noise_grid(p.noise_seed, n, 1, p.noise_scale, p.noise_octaves)
+    k = 1.0 + p.noise_amp * disp[:, :1]
+    return d * k * (rx, rz), d
+
+def noise_frame(p, ring, f):
+    # the ring is displaced too, one noise sample per path x ring point
+    points, dirs = noise_outline(p)
+    disp = noise_grid(p.noise_seed, len(points), len(ring), p.noise_scale, 
+                        p.noise_octaves)
+    ring = ring[None, :, :] * (1.0 + p.noise_amp * disp)[:, :, None]
+    return [sweep(points + f * dirs, -dirs, ring, True, 
+                    signed_area(points) < 0)]
+
+def wave_path(p, rx, rz):
+    res = p.cutter_res + 1
+    i = np.arange(res)
+    x = -rx + i * (2 * rx / (res - 1))
+    z = rz + p.wave_amp * np.sin(i * (p.wave_freq * 2 * math.pi / (res - 1)) 
+                                + p.wave_phase)
+    return np.stack((x, z), axis = -1)
+
+def wave_outline(p):
+    rx, ry, rz = radii_get(p)
+    path = wave_path(p, rx, rz)
+    outline = np.concatenate((path, (path * (1, -1))[::-1]))
+    return outline, np.zeros_like(outline)
+
+def wave_frame(p, ring, f):
+    # open tube along the wave, mirrored below (rotation about x)
+    rx, ry, rz = radii_get(p)
+    path = wave_path(p, rx, rz + f)
+    pad = np.concatenate((path[:1], path, path[-1:]))
+    t = pad[2:] - pad[:-2]
+    t /= np.linalg.norm(t, axis = 1)[:, None]
+    tube = sweep(path, np.stack((-t[:, 1], t[:, 0]), axis = -1), ring, False)
+    return [tube, (tube[0] * (1, -1, -1), tube[1])]
+
+def wave_post(p):
+    return rotation((0, 1, 0), math.pi / 2)[0] if p.wave_flip else None
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    CUTTER MESH
+# ------------------------------------------------------------------------------
+def profile_hook(prof, key):
+    func = getattr(prof, key)
+    return globals()[func] if isinstance(func, str) else func
+
+def cutter_shells(p, prof):
+    # p: any object with the Update operator settings as attributes
+    ry = p.cutter_size[1] / 2
+    f = p.frame_size / 4
+    if p.frame:
+        if prof.curve and p.frame_curve:
+            ring = ring_round(ry, f, p.frame_res)
+        else:
+            ring = ring_flat(ry, f)
+        if prof.frame:
+            shells = profile_hook(prof, 'frame')(p, ring, f)
+        else:
+            points, dirs = profile_hook(prof, 'outline')(p)
+            shells = [sweep(points + f * dirs, -dirs, ring, True, 
+                            signed_area(points) < 0)]
+    else:
+        points, dirs = profile_hook(prof, 'outline')(p)
+        shells = [prism(points, ry, signed_area(points) < 0)]
+    post = profile_hook(prof, 'post')(p) if prof.post else None
+    if post is not None:
+        shells = shells_transform(shells, post, 0.0)
+    if p.radial:
+        rot, loc = radial_transforms(p.radial_axis, p.radial_angle, 
+                                    p.radial_steps, p.radial_radius, 
+                                    p.radial_offset, p.radial_offset_symm)
+        shells = [s for i in range(p.radial_steps) 
+                    for s in shells_transform(shells, rot[i], loc[i])]
+    return shells
+
+def cutter_arrays(p, prof):
+    # radial copies stay contiguous, equal-sized vertex blocks
+    return shells_join(cutter_shells(p, prof))
+
+def wire_edges(loops, totals):
+    # unique (a, b) edges of the faces, for line drawing
+    starts = np.zeros(len(totals), dtype = np.int64)
+    np.cumsum(totals[:-1], out = starts[1:])
+    face = np.repeat(np.arange(len(totals)), totals)
+    first = starts[face]
+    nxt = first + (np.arange(len(loops)) - first + 1) % totals[face]
+    edges = np.sort(np.stack((loops, loops[nxt]), axis = -1), axis = 1)
+    return np.unique(edges, axis = 0).astype(np.int32)
+
+def preview_lines(co, loops, totals, matrix):
+    # overlay batch data: world coords (float32) + line indices
+    m = np.asarray(matrix, dtype = np.float64)
+    world = co @ m[:3, :3].T + m[:3, 3]
+    return world.astype(np.float32), wire_edges(loops, totals)
@@ -0,0 +1,134 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import bpy
+import bmesh
+from bpy.app.handlers import persistent
+from contextlib import contextmanager
+
+# cleared BMesh instances kept for reuse by the next Update/Redo; freed on 
+# error, undo/redo, file load and unregister
+pool = []
+POOL_SIZE = 2
+# rough per-element sizes of Blender's mesh arrays (bytes): vertex, edge, 
+# loop, face; custom data layers and derived caches are not counted
+ELEMENT_BYTES = (20, 12, 8, 12)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    OWNERSHIP [ MCutter datablocks carry the base name as an ID property ]
+# ------------------------------------------------------------------------------
+def mesh_tag(me, name, value = 0):
+    me[name] = value
+    return me
+
+def id_owned(data, name):
+    return data.get(name) is not None
+
+def mesh_bytes(me):
+    counts = (len(me.vertices), len(me.edges), len(me.loops), 
+                len(me.polygons))
+    return sum(c * b for c, b in zip(counts, ELEMENT_BYTES))
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    REPORT/PURGE
+# ------------------------------------------------------------------------------
+def memory_report(name):
+    report = {'meshes': 0, 'orphans': 0, 'verts': 0, 'faces': 0, 'bytes': 0}
+    for me in bpy.data.meshes:
+        if id_owned(me, name):
+            report['meshes'] += 1
+            report['orphans'] += me.users == 0
+            report['verts'] += len(me.vertices)
+            report['faces'] += len(me.polygons)
+            report['bytes'] += mesh_bytes(me)
+    return report
+
+def report_message(report):
+    return (f"MCutter: {report['meshes']} meshes ({report['orphans']} "
+            f"orphans), {report['verts']} verts, {report['faces']} faces, "
+            f"~{report['bytes'] / 1048576:.2f} MB")
+
+def orphans_purge(name):
+    # objects first: an orphan object still holds its mesh
+    count = 0
+    for ob in [ob for ob in bpy.data.objects 
+                if (ob.users == 0) and id_owned(ob, name)]:
+        bpy.data.objects.remove(ob)
+    for me in [me for me in bpy.data.meshes 
+                if (me.users == 0) and id_owned(me, name)]:
+        bpy.data.meshes.remove(me)
+        count += 1
+    return count
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    BMESH POOL
+# ------------------------------------------------------------------------------
+@contextmanager
+def bmesh_pooled():
+    bm = pool.pop() if pool else bmesh.new()
+    try:
+        yield bm
+    except BaseException:
+        # a failed builder may leave the BMesh half-edited: never reuse it
+        bm.free()
+        raise
+    if len(pool) < POOL_SIZE:
+        bm.clear()
+        pool.append(bm)
+        handlers_add()
+    else:
+        bm.free()
+
+def pool_clear():
+    while pool:
+        pool.pop().free()
+
+@persistent
+def pool_reset(dummy):
+    pool_clear()
+
+handlers = (
+    (bpy.app.handlers.undo_post, pool_reset),
+    (bpy.app.handlers.redo_post, pool_reset),
+    (bpy.app.handlers.load_post, pool_reset),
+)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    REGISTER/UNREGISTER [ handlers are added once the pool is used ]
+# ------------------------------------------------------------------------------
+def handlers_add():
+    for handler_list, func in handlers:
+        if func not in handler_list:
+            handler_list.append(func)
+
+def unregister():
+    for handler_list, func in handlers:
+        if func in handler_list:
+            handler_list.remove(func)
+    pool_clear()
@@ -24,59 +24,204 @@
 # ------------------------------------------------------------------------------
 import bpy
 import bmesh
+import json
 import math
-from mathutils import Matrix, Quaternion, Vector
+from mathutils import Matrix
+from .ui import (session_get, session_effects_set, session_switch, UIL_item, 
+                MCUTTER_session)
+from . import memory, preview, profiles, profiling, sources, status
+# numpy, geometry and validate are imported on first use (startup time)
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
 #    SHARED FUNCTIONS
 # ------------------------------------------------------------------------------
+schema = {}
+
+def settings_schema(kind):
+    # (name, is_array) of the settings stored on cutter items ('CUTTER') or 
+    # sessions ('TARGET') that the Update operator edits; read from RNA once, 
+    # so a new property is copied as soon as it is on both classes
+    keys = schema.get(kind)
+    if keys is None:
+        store = UIL_item if kind == 'CUTTER' else MCUTTER_session
+        op_props = bpy.ops.mcutter.update.get_rna_type().properties
+        # writable value properties only: not rna_type, pointers or 
+        # collections
+        keys = tuple((prop.identifier, getattr(prop, 'is_array', False)) 
+                    for prop in store.bl_rna.properties 
+                    if (prop.identifier in op_props) and 
+                        (prop.identifier != 'rna_type') and 
+                        (not prop.is_readonly) and 
+                        (prop.type not in {'POINTER', 'COLLECTION'}))
+        schema[kind] = keys
+    return keys
+
+def settings_copy(from_ob, to_ob, kind):
+    # only changed values are set: fewer RNA writes and update callbacks
+    for key, is_array in settings_schema(kind):
+        value = getattr(from_ob, key)
+        if is_array:
+            if tuple(getattr(to_ob, key)) != tuple(value):
+                setattr(to_ob, key, value)
+        elif getattr(to_ob, key) != value:
+            setattr(to_ob, key, value)
+
+# Update stages, each rerun only when its settings change; the cutter settings 
+# not listed here are geometry, display toggles always apply
+STAGES = ('transform', 'geometry', 'cutter_mods', 'target_mods')
+STAGE_KEYS = {
+    'transform': {'cutter_rot', 'rot_local', 'cutter_pos', 'pos_local'},
+    'cutter_mods': {'bevel_width', 'bevel_clamp_overlap', 'bevel_res', 
+                    'bevel_profile'},
+    'target_mods': {'cutter_bool_op', 'cutter_effect', 'cutter_solver'},
+    }
+STAGE_DISPLAY = {'target_wire'}
+# session settings (target bevel, symmetry, solver) are shared by all the 
+# items: their digest is stored on the session, not on each item
+STAGE_SESSION = 'session_mods'
+
+def stage_of(kind, key):
+    if kind == 'TARGET':
+        return STAGE_SESSION
+    for stage, keys in STAGE_KEYS.items():
+        if key in keys:
+            return stage
+    return 'geometry'
+
+def values_hash(values):
+    from hashlib import blake2b
+    return blake2b(repr(values).encode(), digest_size = 16).hexdigest()
+
 def copy_tgt_settings(from_ob, to_ob):
-    to_ob.target_wire = from_ob.target_wire
-    to_ob.target_bevel_width = from_ob.target_bevel_width
-    to_ob.target_bevel_clamp_overlap = from_ob.target_bevel_clamp_overlap
-    to_ob.target_bevel_res = from_ob.target_bevel_res
-    to_ob.target_bevel_profile = from_ob.target_bevel_profile
+    settings_copy(from_ob, to_ob, 'TARGET')
 
 def copy_ctr_settings(from_ob, to_ob):
-    to_ob.cutter_profile = from_ob.cutter_profile
-    to_ob.cutter_bool_op = from_ob.cutter_bool_op
-    to_ob.cutter_res = from_ob.cutter_res
-    to_ob.frame = from_ob.frame
-    to_ob.frame_size = from_ob.frame_size
-    to_ob.frame_curve = from_ob.frame_curve
-    to_ob.frame_res = from_ob.frame_res
-    to_ob.radial = from_ob.radial
-    to_ob.radial_steps = from_ob.radial_steps
-    to_ob.radial_axis = from_ob.radial_axis
-    to_ob.radial_angle = from_ob.radial_angle
-    to_ob.radial_radius = from_ob.radial_radius
-    to_ob.radial_offset = from_ob.radial_offset
-    to_ob.radial_offset_symm = from_ob.radial_offset_symm
-    to_ob.wave_freq = from_ob.wave_freq
-    to_ob.wave_amp = from_ob.wave_amp
-    to_ob.wave_phase = from_ob.wave_phase
-    to_ob.wave_flip = from_ob.wave_flip
-    to_ob.cutter_size = from_ob.cutter_size
-    to_ob.cutter_rot = from_ob.cutter_rot
-    to_ob.rot_local = from_ob.rot_local
-    to_ob.cutter_pos = from_ob.cutter_pos
-    to_ob.pos_local = from_ob.pos_local
-    to_ob.bevel_width = from_ob.bevel_width
-    to_ob.bevel_clamp_overlap = from_ob.bevel_clamp_overlap
-    to_ob.bevel_res = from_ob.bevel_res
-    to_ob.bevel_profile = from_ob.bevel_profile
+    settings_copy(from_ob, to_ob, 'CUTTER')
     for i_from, i_to in zip(from_ob.arr_coll, to_ob.arr_coll):
         i_to.count = i_from.count
         i_to.offset = i_from.offset
 
+def update_params(session, item):
+    # stored cutter/target settings as Update operator arguments, for 
+    # non-interactive updates (no invoke to copy them)
+    params = {}
+    for src, kind in ((item, 'CUTTER'), (session, 'TARGET')):
+        for key, is_array in settings_schema(kind):
+            value = getattr(src, key)
+            params[key] = tuple(value) if is_array else value
+    params['arr_coll'] = [{'name': a.name, 'count': a.count, 
+                            'offset': tuple(a.offset)} for a in item.arr_coll]
+    params.update({'target_visible': True, 'target_wire': False, 
+                    'cutter_visible': False, 'cutter_wire': False})
+    return params
+
 def target_mod_remove(target, mod_name):
     mod = target.modifiers.get(mod_name)
     if mod and mod.type == 'BOOLEAN':
         target.modifiers.remove(mod)
 
+def solver_get(cutter_solver, target_solver, final = False):
+    # AUTO: fast while editing, exact when the stack is applied
+    solver = target_solver if cutter_solver == 'DEFAULT' else cutter_solver
+    if solver == 'AUTO':
+        solver = 'EXACT' if final else 'FAST'
+    return solver
+
+def target_bool_update(target, mod_name, cutter, operation, show, 
+                        solver = 'FAST'):
+    found = False
+    mod = target.modifiers.get(mod_name)
+    if mod and mod.type == 'BOOLEAN':
+        found = True
+    if not found:
+        mod = target.modifiers.new(name = mod_name, type = 'BOOLEAN')    
+    mod.operation = operation
+    if hasattr(mod, 'solver'):
+        # boolean solvers are available from Blender 2.91
+        mod.solver = solver
+    mod.object = cutter
+    mod.show_viewport = show
+    mod.show_expanded = False
+    return mod
+
+def modifier_move(ob, name, index):
+    # direct index move: only the modifiers between the old and the new 
+    # position shift, the rest of the stack keeps its evaluation order
+    idx = ob.modifiers.find(name)
+    if idx < 0 or idx == index:
+        return
+    if hasattr(ob.modifiers, 'move'):
+        # Blender 3.5+
+        ob.modifiers.move(idx, index)
+        return
+    bpy.context.view_layer.objects.active = ob
+    if hasattr(bpy.ops.object, 'modifier_move_to_index'):
+        # Blender 2.90+
+        bpy.ops.object.modifier_move_to_index(modifier = name, index = index)
+        return
+    op = (bpy.ops.object.modifier_move_up if index < idx else 
+            bpy.ops.object.modifier_move_down)
+    for i in range(abs(index - idx)):
+        op(modifier = name)
+
+def modifier_move_to_top(ob, name, type):
+    mod = ob.modifiers.get(name)
+    if mod and mod.type == type:
+        modifier_move(ob, name, 0)
+
+def modifier_move_to_bottom(ob, name, type):
+    mod = ob.modifiers.get(name)
+    if mod and mod.type == type:
+        modifier_move(ob, name, len(ob.modifiers) - 1)
+
+def target_tail_order(target):
+    # booleans first, then the session Symmetry and Bevel
+    modifier_move_to_bottom(target, 'Symmetry', 'MIRROR')
+    modifier_move_to_bottom(target, 'Bevel', 'BEVEL')
+
+def modifier_place(ob, name, names):
+    # move boolean 'name' next to its nearest neighbour in the list order 
+    # 'names' that has a boolean on ob (cutters not updated yet have none)
+    idx = ob.modifiers.find(name)
+    if idx < 0:
+        return
+    i = names.index(name)
+    for other in names[i + 1:]:
+        pos = ob.modifiers.find(other)
+        if pos >= 0:
+            modifier_move(ob, name, pos if idx > pos else pos - 1)
+            return
+    for other in reversed(names[:i]):
+        pos = ob.modifiers.find(other)
+        if pos >= 0:
+            modifier_move(ob, name, pos + 1 if idx > pos else pos)
+            return
+
+shade_buffer = []
+
+def mesh_shading_set(me, smooth, auto_smooth):
+    # one flag buffer, grown as needed, instead of a new list per call
+    import numpy as np
+    n = len(me.polygons)
+    if not shade_buffer or len(shade_buffer[0]) < n:
+        shade_buffer[:] = [np.empty(max(n, 1024), dtype = bool)]
+    flags = shade_buffer[0][:n]
+    flags[:] = smooth
+    me.polygons.foreach_set('use_smooth', flags)
+    me.use_auto_smooth = auto_smooth
+
+def cutter_find(name, uid, target, coll):
+    found = None        
+    for ob in coll.objects:
+        if (ob.keys() and ob.get(name) and (ob[name] == uid) and 
+            (ob.type == 'MESH') and (ob is not target)):
+            found = ob
+            break
+    return found
+
 def cutter_add(prop_name, prop_val, coll):
-    me = bpy.data.meshes.new(prop_name)
+    me = memory.mesh_tag(bpy.data.meshes.new(prop_name), prop_name, prop_val)
     ob = bpy.data.objects.new(prop_name, me)
     ob[prop_name] = prop_val
     coll.objects.link(ob)
@@ -93,14 +238,88 @@ def temps_remove(scene, coll_name):
                     bpy.data.meshes.remove(me)
         if (not coll.objects) and (not coll.children):
             bpy.data.collections.remove(coll)
+
+def session_find(props, target_name):
+    for i, session in enumerate(props.sessions):
+        if session.target_name == target_name:
+            return i, session
+    return -1, None
+
+def session_close(context, props):
+    # shared cutters die with their session: drop their modifiers on other 
+    # targets and forget links pointing to the closing target
+    scene = context.scene
+    idx = props.session_idx
+    session = props.sessions[idx]
+    count = 0
+    for item in session.ul_coll:
+        count += links_remove(scene, item)
+        preview.overlay_remove(item.uid)
+    for other in props.sessions:
+        for item in other.ul_coll:
+            i = item.links.find(session.target_name)
+            if i >= 0:
+                item.links.remove(i)
+    props.sessions.remove(idx)
+    props.session_idx = max(0, min(idx - 1, len(props.sessions) - 1))
+    session_switch(props, context)
+    status.invalidate()
+    return count
+
+def links_remove(scene, item):
+    count = 0
+    for link in item.links:
+        target = scene.objects.get(link.name)
+        if target and target.modifiers.get(item.p_name):
+            target_mod_remove(target, item.p_name)
+            count += 1
+    item.links.clear()
+    return count
+
+def links_shared(session):
+    # targets of other sessions that lose their shared cuts on session close
+    return sorted({link.name for item in session.ul_coll 
+                    for link in item.links})
+
+def close_invoke(op, context, event):
+    # plain confirm, or a dialog naming the targets that lose shared cuts
+    op.shared = links_shared(session_get(context.scene.ptmc_props))
+    wm = context.window_manager
+    if op.shared:
+        return wm.invoke_props_dialog(op, width = 320)
+    return wm.invoke_confirm(op, event)
+
+def close_draw(op, layout):
+    if getattr(op, 'shared', None):
+        layout.label(text = 'Shared cutters are removed from:', icon = 'ERROR')
+        col = layout.column(align = True)
+        for name in op.shared:
+            col.label(text = name, icon = 'OBJECT_DATA')
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
 #    CALLBACK FUNCTIONS
 # ------------------------------------------------------------------------------
 def update_style(self, context):
-    if self.cutter_profile == 'Rectangle':
+    if not profiles.PROFILES[self.cutter_profile].curve:
         self.frame_curve = False
+
+share_items = []
+
+def share_targets(self, context):
+    # enum items must stay referenced while the operator uses them
+    props = context.scene.ptmc_props
+    session = session_get(props)
+    share_items.clear()
+    if session is None:
+        return share_items
+    item = session.ul_coll[session.ul_idx]
+    for other in props.sessions:
+        name = other.target_name
+        if ((name != session.target_name) and (name not in item.links) and 
+            context.scene.objects.get(name)):
+            share_items.append((name, name, f'Cut {name}'))
+    return share_items
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
@@ -129,23 +348,30 @@ class MCUTTER_OT_restart(bpy.types.Operator):
     bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
 
     def invoke(self, context, event):
-        return context.window_manager.invoke_confirm(self, event)
+        return close_invoke(self, context, event)
+
+    def draw(self, context):
+        close_draw(self, self.layout)
 
     def execute(self, context):
         scene = context.scene
         props = scene.ptmc_props
+        session = session_get(props)
         if props.temps_clear:
-            target = scene.objects.get(props.target_name)
+            target = scene.objects.get(session.target_name)
             if target and target.type == 'MESH':
                 me = target.data
                 bpy.data.objects.remove(target)
                 if me.users == 0:
                     bpy.data.meshes.remove(me)
-            temps_remove(scene, props.coll_name)
-        props.ul_coll.clear()
+            temps_remove(scene, session.coll_name)
+            memory.orphans_purge(props.base_name)
+        if session_close(context, props):
+            self.report({'WARNING'}, 'Shared cutters removed from targets')
         props.target_old_mods_remove = True
         props.target_apply_scale = True
-        context.area.tag_redraw()
+        if context.area:
+            context.area.tag_redraw()
         return {'FINISHED'}
 
 class MCUTTER_OT_target_set(bpy.types.Operator):
@@ -157,14 +383,17 @@ class MCUTTER_OT_target_set(bpy.types.Operator):
     @classmethod
     def poll(self, context):
         ob = context.object
-        return ((ob is not None) and (ob.type == 'MESH') and 
-                (len(ob.data.polygons) > 0))
+        if (ob is None) or (ob.type != 'MESH') or (not ob.data.polygons):
+            return False
+        # a session target or a cutter cannot start another session
+        props = context.scene.ptmc_props
+        return ((session_find(props, ob.name)[0] < 0) and 
+                (ob.get(props.base_name) is None))
 
     def execute(self, context):
         scene = context.scene
         props = scene.ptmc_props
-        props.target_name = self.target_add(context)
-        target = scene.objects.get(props.target_name)
+        target = scene.objects.get(self.target_add(context))
         if props.target_old_mods_remove:
             target.modifiers.clear()
         if props.target_apply_scale:
@@ -173,13 +402,19 @@ class MCUTTER_OT_target_set(bpy.types.Operator):
                 ms[i][i] = target.scale[i]
             target.data.transform(ms)
             target.matrix_world @= ms.inverted()
-        props.coll_name = self.new_collection(scene, 
+        session = props.sessions.add()
+        session.name = target.name
+        session.target_name = target.name
+        if props.target_prep:
+            session.prep_info = self.target_prep(target.data, 
+                                                props.target_prep_dist)
+        session.coll_name = self.new_collection(scene, 
                                     f'{props.base_name}_{target.name}_Temp')
-        coll = scene.collection.children.get(props.coll_name)
-        props.ob_id = 1
+        coll = scene.collection.children.get(session.coll_name)
+        props.ob_id += 1
         cutter = scene.objects.get(cutter_add(props.base_name, 
                                                 props.ob_id, coll))
-        item = props.ul_coll.add()
+        item = session.ul_coll.add()
         item.uid = props.ob_id
         item.name = f'{props.base_name}_{props.ob_id}'
         item.p_name = f'{props.base_name}_{props.ob_id}'
@@ -188,17 +423,22 @@ class MCUTTER_OT_target_set(bpy.types.Operator):
             arr.name = f'Array_{i + 1}'
         cutter.hide_viewport = True
         cutter.show_wire = False
-        self.init_props(props)
-        context.area.tag_redraw()
+        # shading is set once here, Update only touches the cutter mesh
+        mesh_shading_set(target.data, True, True)
+        self.init_props(props, session)
+        props.session_idx = len(props.sessions) - 1
+        if context.area:
+            context.area.tag_redraw()
+        status.invalidate()
         return {'FINISHED'}
 
-    def init_props(self, props):
-        props.target_bevel_width = 0.0
-        props.target_bool_effects = True
-        props.target_wire = False
+    def init_props(self, props, session):
+        session.target_bevel_width = 0.0
+        session.target_bool_effects = True
+        session.target_wire = False
         props.copy_setts = True
         props.temps_clear = True
-        props.ul_idx = len(props.ul_coll) - 1        
+        session.ul_idx = len(session.ul_coll) - 1        
 
     def item_collection(self, scene, item):
         collections = item.users_collection
@@ -206,6 +446,28 @@ class MCUTTER_OT_target_set(bpy.types.Operator):
             return collections[0]
         return scene.collection
 
+    def target_prep(self, me, dist):
+        # runs once per session: every boolean evaluation after this starts 
+        # from the cleaned copy
+        counts = (len(me.vertices), len(me.polygons))
+        with memory.bmesh_pooled() as bm:
+            bm.from_mesh(me)
+            bmesh.ops.remove_doubles(bm, verts = bm.verts, dist = dist)
+            ngons = [f for f in bm.faces if len(f.verts) > 4]
+            if ngons:
+                bmesh.ops.triangulate(bm, faces = ngons)
+            bmesh.ops.recalc_face_normals(bm, faces = bm.faces)
+            loose = [e for e in bm.edges if not e.link_faces]
+            if loose:
+                bmesh.ops.delete(bm, geom = loose, context = 'EDGES')
+            loose = [v for v in bm.verts if not v.link_faces]
+            if loose:
+                bmesh.ops.delete(bm, geom = loose, context = 'VERTS')
+            bm.to_mesh(me)
+        me.update()
+        return (f'verts {counts[0]} > {len(me.vertices)}, '
+                f'faces {counts[1]} > {len(me.polygons)}')
+
     def new_collection(self, scene, name):
         coll = bpy.data.collections.new(name)
         scene.collection.children.link(coll)
@@ -233,13 +495,11 @@ class MCUTTER_OT_show_target(bpy.types.Operator):
     
     def execute(self, context):
         scene = context.scene
-        props = scene.ptmc_props
-        target = scene.objects.get(props.target_name)
+        session = session_get(scene.ptmc_props)
+        target = scene.objects.get(session.target_name)
         target.hide_viewport = False
-        target.show_wire = props.target_wire
-        for mod in target.modifiers:
-            if mod.type == 'BOOLEAN':
-                mod.show_viewport = props.target_bool_effects
+        target.show_wire = session.target_wire
+        session_effects_set(scene, session, True)
         return {'FINISHED'}
 
 class MCUTTER_OT_add_item(bpy.types.Operator):
@@ -248,11 +508,13 @@ class MCUTTER_OT_add_item(bpy.types.Operator):
     bl_description = "Add new cutter"
     bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
 
-    def invoke(self, context, event):
-        props = context.scene.ptmc_props
-        old_item = props.ul_coll[props.ul_idx]
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptmc_props
+        session = session_get(props)
+        old_item = session.ul_coll[session.ul_idx]
         props.ob_id += 1
-        item = props.ul_coll.add()
+        item = session.ul_coll.add()
         item.uid = props.ob_id
         item.name = f'{props.base_name}_{props.ob_id}'
         item.p_name = f'{props.base_name}_{props.ob_id}'
@@ -261,17 +523,13 @@ class MCUTTER_OT_add_item(bpy.types.Operator):
             arr.name = f'Array_{i + 1}'
         if props.copy_setts:
             copy_ctr_settings(old_item, item)
-        props.ul_idx = len(props.ul_coll) - 1
-        return self.execute(context)
-
-    def execute(self, context):
-        scene = context.scene
-        props = scene.ptmc_props
-        coll = scene.collection.children.get(props.coll_name)
+        session.ul_idx = len(session.ul_coll) - 1
+        coll = scene.collection.children.get(session.coll_name)
         cutter = scene.objects.get(cutter_add(props.base_name, 
                                                 props.ob_id, coll))
         cutter.hide_viewport = True
         cutter.show_wire = False
+        status.invalidate()
         return {'FINISHED'}
 
 class MCUTTER_OT_remove_item(bpy.types.Operator):
@@ -282,19 +540,24 @@ class MCUTTER_OT_remove_item(bpy.types.Operator):
 
     @classmethod
     def poll(self, context):
-        return (len(context.scene.ptmc_props.ul_coll) > 1)
+        session = session_get(context.scene.ptmc_props)
+        return (session is not None) and (len(session.ul_coll) > 1)
     
     def execute(self, context):
         scene = context.scene
         props = scene.ptmc_props
-        target = scene.objects.get(props.target_name)
-        coll = scene.collection.children.get(props.coll_name)
-        idx = props.ul_idx
-        item = props.ul_coll[idx]
+        session = session_get(props)
+        target = scene.objects.get(session.target_name)
+        coll = scene.collection.children.get(session.coll_name)
+        idx = session.ul_idx
+        item = session.ul_coll[idx]
         target_mod_remove(target, item.p_name)
+        links_remove(scene, item)
+        preview.overlay_remove(item.uid)
         self.cutter_remove(props.base_name, item.uid, target, coll)
-        props.ul_coll.remove(idx)
-        props.ul_idx = min(max(0, idx - 1), len(props.ul_coll) - 1) 
+        session.ul_coll.remove(idx)
+        session.ul_idx = min(max(0, idx - 1), len(session.ul_coll) - 1) 
+        status.invalidate()
         return {'FINISHED'}
 
     def cutter_remove(self, name, uid, target, coll):
@@ -307,6 +570,173 @@ class MCUTTER_OT_remove_item(bpy.types.Operator):
                     bpy.data.meshes.remove(me)
                 break
 
+class MCUTTER_OT_move_item(bpy.types.Operator):
+    bl_label = "Cutter Move"
+    bl_idname = "mcutter.move_item"
+    bl_description = "Move selected cutter (and its Target boolean) up/down"
+    bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
+
+    direction: bpy.props.EnumProperty(
+        name = 'Direction', 
+        items = (('UP', 'Up', 'Move up'), ('DOWN', 'Down', 'Move down')),
+        default = 'UP'
+        )
+
+    @classmethod
+    def poll(self, context):
+        session = session_get(context.scene.ptmc_props)
+        return (session is not None) and (len(session.ul_coll) > 1)
+
+    def execute(self, context):
+        scene = context.scene
+        session = session_get(scene.ptmc_props)
+        idx = session.ul_idx
+        idx_new = idx - 1 if self.direction == 'UP' else idx + 1
+        if not (0 <= idx_new < len(session.ul_coll)):
+            return {'CANCELLED'}
+        session.ul_coll.move(idx, idx_new)
+        session.ul_idx = idx_new
+        item = session.ul_coll[idx_new]
+        names = [i.p_name for i in session.ul_coll]
+        # the boolean moves past its neighbours only, on the session target 
+        # and the targets sharing the cutter: modifiers above keep their 
+        # evaluated result
+        active = context.view_layer.objects.active
+        for name in [session.target_name] + [link.name for link in item.links]:
+            target = scene.objects.get(name)
+            if target:
+                modifier_place(target, item.p_name, names)
+        context.view_layer.objects.active = active
+        return {'FINISHED'}
+
+class MCUTTER_OT_share_item(bpy.types.Operator):
+    bl_label = "Cutter Share"
+    bl_idname = "mcutter.share_item"
+    bl_description = "Use selected cutter on another session target"
+    bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
+
+    share_target: bpy.props.EnumProperty(
+        items = share_targets,
+        name = 'Target',
+        description = 'Session target to cut'
+        )
+
+    @classmethod
+    def poll(self, context):
+        return len(context.scene.ptmc_props.sessions) > 1
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptmc_props
+        session = session_get(props)
+        item = session.ul_coll[session.ul_idx]
+        owner = scene.objects.get(session.target_name)
+        coll = scene.collection.children.get(session.coll_name)
+        cutter = cutter_find(props.base_name, item.uid, owner, coll)
+        target = scene.objects.get(self.share_target)
+        if (cutter is None) or (target is None):
+            self.report({'WARNING'}, 'MCutter object not found')
+            return {'CANCELLED'}
+        # the other session is inactive, its booleans stay hidden
+        target_bool_update(target, item.p_name, cutter, item.cutter_bool_op, 
+                            False, solver_get(item.cutter_solver, 
+                                                session.target_solver))
+        active = context.view_layer.objects.active
+        target_tail_order(target)
+        context.view_layer.objects.active = active
+        link = item.links.add()
+        link.name = target.name
+        return {'FINISHED'}
+
+class MCUTTER_OT_unshare_item(bpy.types.Operator):
+    bl_label = "Cutter Unshare"
+    bl_idname = "mcutter.unshare_item"
+    bl_description = "Remove selected cutter from all other targets"
+    bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
+
+    @classmethod
+    def poll(self, context):
+        session = session_get(context.scene.ptmc_props)
+        return ((session is not None) and session.ul_coll and 
+                len(session.ul_coll[session.ul_idx].links) > 0)
+
+    def execute(self, context):
+        session = session_get(context.scene.ptmc_props)
+        links_remove(context.scene, session.ul_coll[session.ul_idx])
+        return {'FINISHED'}
+
+class MCUTTER_OT_freeze_item(bpy.types.Operator):
+    bl_label = "Cutter Freeze"
+    bl_idname = "mcutter.freeze_item"
+    bl_description = ("Freeze: bake the cutter modifiers into its mesh. "
+                        "Unfreeze: regenerate the cutter from its settings")
+    bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
+
+    @classmethod
+    def poll(self, context):
+        session = session_get(context.scene.ptmc_props)
+        if (session is None) or (not session.ul_coll):
+            return False
+        # a previewed cutter mesh is stale until Commit builds it
+        return not session.ul_coll[session.ul_idx].previewed
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.ptmc_props
+        session = session_get(props)
+        item = session.ul_coll[session.ul_idx]
+        if item.frozen:
+            # a regular update rebuilds the mesh and the modifiers
+            return bpy.ops.mcutter.update('EXEC_DEFAULT', 
+                                            **update_params(session, item))
+        target = scene.objects.get(session.target_name)
+        coll = scene.collection.children.get(session.coll_name)
+        cutter = cutter_find(props.base_name, item.uid, target, coll)
+        if cutter is None:
+            self.report({'WARNING'}, 'MCutter object not found')
+            return {'CANCELLED'}
+        hidden = cutter.hide_viewport
+        cutter.hide_viewport = False
+        dg = context.evaluated_depsgraph_get()
+        me_new = bpy.data.meshes.new_from_object(cutter.evaluated_get(dg))
+        memory.mesh_tag(me_new, props.base_name, item.uid)
+        cutter.hide_viewport = hidden
+        me_old = cutter.data
+        cutter.data = me_new
+        cutter.modifiers.clear()
+        name = me_old.name
+        if me_old.users == 0:
+            bpy.data.meshes.remove(me_old)
+            me_new.name = name
+        item.frozen = True
+        return {'FINISHED'}
+
+class MCUTTER_OT_preview_commit(bpy.types.Operator):
+    bl_label = "Commit Preview"
+    bl_idname = "mcutter.preview_commit"
+    bl_description = "Build the previewed cutters and their booleans"
+    bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
+
+    @classmethod
+    def poll(self, context):
+        session = session_get(context.scene.ptmc_props)
+        return (session is not None) and any(item.previewed 
+                                            for item in session.ul_coll)
+
+    def execute(self, context):
+        session = session_get(context.scene.ptmc_props)
+        idx = session.ul_idx
+        for i, item in enumerate(session.ul_coll):
+            if item.previewed:
+                session.ul_idx = i
+                bpy.ops.mcutter.update('EXEC_DEFAULT', 
+                                        **update_params(session, item))
+        session.ul_idx = min(idx, len(session.ul_coll) - 1)
+        return {'FINISHED'}
+
 class MCUTTER_OT_update(bpy.types.Operator):
     bl_label = "Update"
     bl_idname = "mcutter.update"
@@ -365,11 +795,7 @@ class MCUTTER_OT_update(bpy.types.Operator):
         )
     arr_coll: bpy.props.CollectionProperty(type = CUT_array)
     cutter_profile: bpy.props.EnumProperty(
-        items = (
-        ('Rectangle', 'Rectangle', 'rectangle profile'),
-        ('Ellipse', 'Ellipse', 'ellipse profile'),
-        ('Wave', 'Wave', 'wave profile'),
-        ),
+        items = profiles.profile_items(),
         name = 'Profile',
         description = 'Select profile',
         default = 'Ellipse',
@@ -385,6 +811,17 @@ class MCUTTER_OT_update(bpy.types.Operator):
         description = 'Select boolean operation',
         default = 'DIFFERENCE',
         )
+    cutter_solver: bpy.props.EnumProperty(
+        items = (
+        ('DEFAULT', 'Default', 'use the session solver'),
+        ('FAST', 'Fast', 'fast boolean solver'),
+        ('EXACT', 'Exact', 'exact boolean solver'),
+        ('AUTO', 'Auto', 'fast while editing, exact on finalize'),
+        ),
+        name = 'Solver',
+        description = 'Select boolean solver',
+        default = 'DEFAULT',
+        )
     cutter_size: bpy.props.FloatVectorProperty(
         name = 'Size', description = 'Cutter dimensions', 
         default = [2.5, 0.1, 2.5], min = 0.0001, size = 3
@@ -393,6 +830,16 @@ class MCUTTER_OT_update(bpy.types.Operator):
         name = 'Profile Segs', description = 'Profile segments', 
         default = 4, min = 3, soft_max = 90
         )
+    cutter_validate: bpy.props.EnumProperty(
+        items = (
+        ('OFF', 'No Check', 'do not check the cutter geometry'),
+        ('WARN', 'Warn', 'report degenerate cutter geometry'),
+        ('FIX', 'Fix', 'merge degenerate cutter geometry'),
+        ),
+        name = 'Check',
+        description = 'Degenerate geometry check',
+        default = 'WARN',
+        )
     frame: bpy.props.BoolProperty(
         name = 'Frame', description = 'Use frame cutter', 
         default = False
@@ -443,6 +890,11 @@ class MCUTTER_OT_update(bpy.types.Operator):
         name = 'Offset Mirror', description = 'Radial offset symmetry', 
         default = False
         )
+    radial_merge: bpy.props.BoolProperty(
+        name = 'Merge', 
+        description = 'Union the radial copies into a single volume', 
+        default = False
+        )
     wave_freq: bpy.props.FloatProperty(
         name = 'Frequency', description = 'Wave frequency', 
         default = 0.5
@@ -459,6 +911,30 @@ class MCUTTER_OT_update(bpy.types.Operator):
         name = 'Flip', description = 'Wave flip profile axes', 
         default = False
         )
+    star_ratio: bpy.props.FloatProperty(
+        name = 'Inner Ratio', description = 'Star inner radius ratio', 
+        default = 0.5, min = 0.01, max = 1.0
+        )
+    custom_source: bpy.props.StringProperty(
+        name = 'Source', description = 'Curve or flat mesh outline object', 
+        default = ''
+        )
+    noise_seed: bpy.props.IntProperty(
+        name = 'Seed', description = 'Noise seed', 
+        default = 0, min = 0
+        )
+    noise_scale: bpy.props.FloatProperty(
+        name = 'Scale', description = 'Noise features around the profile', 
+        default = 4.0, min = 1.0, soft_max = 32.0
+        )
+    noise_octaves: bpy.props.IntProperty(
+        name = 'Octaves', description = 'Noise detail levels', 
+        default = 2, min = 1, max = 8
+        )
+    noise_amp: bpy.props.FloatProperty(
+        name = 'Amplitude', description = 'Noise displacement (size ratio)', 
+        default = 0.2, min = 0.0, soft_max = 1.0
+        )
     cutter_rot: bpy.props.FloatVectorProperty(
         name = 'Rotation', description = 'Rotate the cutter', 
         default = [0.0, 0.0, 0.0], size = 3, subtype = 'EULER'
@@ -507,53 +983,110 @@ class MCUTTER_OT_update(bpy.types.Operator):
         name = 'Profile', description = 'Bevel profile', 
         default = 0.5, min = 0.0, max = 1.0
         )
+    target_solver: bpy.props.EnumProperty(
+        items = (
+        ('FAST', 'Fast', 'fast boolean solver'),
+        ('EXACT', 'Exact', 'exact boolean solver'),
+        ('AUTO', 'Auto', 'fast while editing, exact on finalize'),
+        ),
+        name = 'Session Solver',
+        description = 'Default boolean solver of the session cutters',
+        default = 'AUTO',
+        )
+    target_symmetry: bpy.props.BoolVectorProperty(
+        name = 'Symmetry', 
+        description = 'Mirror the cut Target in its local axes', 
+        default = (False, False, False), size = 3, subtype = 'XYZ'
+        )
+    preview: bpy.props.BoolProperty(
+        name = 'Preview', 
+        description = 'Draw the cutter only, build it on Commit', 
+        default = False, options = {'SKIP_SAVE'}
+        )
 
     def invoke(self, context, event):
         props = context.scene.ptmc_props
-        item = props.ul_coll[props.ul_idx]
+        session = session_get(props)
+        item = session.ul_coll[session.ul_idx]
+        self.preview = props.preview
         self.arr_coll.clear()
         for i in range(2):
             arr = self.arr_coll.add()
             arr.name = f'Array_{i+1}'
         copy_ctr_settings(item, self)
-        copy_tgt_settings(props, self)
+        copy_tgt_settings(session, self)
         return self.execute(context)
 
     def execute(self, context):
         scene = context.scene
         props = scene.ptmc_props
-        target = scene.objects.get(props.target_name)
-        coll = scene.collection.children.get(props.coll_name)
-        item = props.ul_coll[props.ul_idx]
-        cutter = self.cutter_get(props.base_name, item.uid, target, coll)
+        session = session_get(props)
+        target = scene.objects.get(session.target_name)
+        coll = scene.collection.children.get(session.coll_name)
+        item = session.ul_coll[session.ul_idx]
+        cutter = cutter_find(props.base_name, item.uid, target, coll)
         if cutter is None:
-            idx = props.ul_idx
+            idx = session.ul_idx
             target_mod_remove(target, item.p_name)
-            if len(props.ul_coll) > 1:
-                props.ul_coll.remove(idx)
-                props.ul_idx = min(max(0, idx - 1), len(props.ul_coll) - 1) 
+            links_remove(scene, item)
+            if len(session.ul_coll) > 1:
+                session.ul_coll.remove(idx)
+                session.ul_idx = min(max(0, idx - 1), 
+                                    len(session.ul_coll) - 1) 
+            status.invalidate()
             self.report({'WARNING'}, 'MCutter object not found')
             return {'CANCELLED'}
-        self.cutter_transform(cutter, target)
-        if self.cutter_profile == 'Wave':
-            self.cutter_mesh_update_wave(cutter.data)
-        elif self.cutter_profile == 'Ellipse':
-            self.cutter_mesh_update_ellipse(cutter.data)
-        else:
-            self.cutter_mesh_update_rectangle(cutter.data)
-        self.mesh_options_update(cutter.data, True, True)
-        self.mesh_options_update(target.data, True, True)
-        self.cutter_mods_update(cutter)
-        self.target_mods_update(target, item.p_name, cutter)
+        outline = None
+        if self.cutter_profile == 'Custom':
+            outline = sources.source_outline(context, self.custom_source)
+            if outline is None:
+                self.report({'WARNING'}, 
+                            'MCutter: no closed outline in the Custom source')
+        if self.preview:
+            # overlay only: the cutter object, mesh, checks and booleans 
+            # wait for the commit
+            preview.overlay_set(item.uid, *profiles.cutter_arrays(self), 
+                                self.cutter_matrix(cutter, target))
+            copy_ctr_settings(self, item)
+            copy_tgt_settings(self, session)
+            item.previewed = True
+            return {'FINISHED'}
+        # only the stages whose settings changed since the last update run
+        hashes = self.stage_hashes(target, outline)
+        dirty = self.stages_dirty(session, item, hashes, target, cutter)
+        preview.overlay_remove(item.uid)
+        item.previewed = False
+        if 'transform' in dirty:
+            self.cutter_transform(cutter, target)
+        if 'geometry' in dirty:
+            self.mesh_write(cutter.data, *profiles.cutter_arrays(self))
+            copies, stacked = self.mesh_validate(cutter.data)
+            if self.radial and (self.radial_merge or stacked):
+                self.radial_union(coll, cutter.data, props.base_name, copies)
+            mesh_shading_set(cutter.data, True, True)
+        if 'cutter_mods' in dirty:
+            self.cutter_mods_update(cutter)
+        if 'target_mods' in dirty:
+            self.target_mods_update(target, item.p_name, cutter)
+            self.links_update(scene, props, item, cutter)
         copy_ctr_settings(self, item)
-        copy_tgt_settings(self, props)
+        copy_tgt_settings(self, session)
+        if STAGE_SESSION in dirty:
+            # after the copy: the solver sync reads the stored item solvers
+            self.session_mods_update(scene, session, target)
+        item.frozen = False
+        item.stage_hashes = json.dumps({stage: hashes[stage] 
+                                        for stage in STAGES})
+        session.stage_hash = hashes[STAGE_SESSION]
         target.hide_viewport = not self.target_visible
         target.show_wire = self.target_wire
         cutter.hide_viewport = not self.cutter_visible
         cutter.show_wire = self.cutter_wire
+        status.invalidate()
         return {'FINISHED'}
 
     def draw(self, context):
+        prof = profiles.PROFILES[self.cutter_profile]
         layout = self.layout
         box = layout.box()
         col_main = box.column()
@@ -579,6 +1112,13 @@ class MCUTTER_OT_update(bpy.types.Operator):
         row = box.row(align = True)
         row.prop(self, 'cutter_profile', text = '')
         row.prop(self, 'cutter_bool_op', text = '')
+        row = box.row(align = True)
+        row.prop(self, 'cutter_solver')
+        row.prop(self, 'target_solver', text = 'Session')
+        row = box.row(align = True)
+        row.prop(self, 'target_symmetry', toggle = True)
+        row = box.row()
+        row.prop(self, 'preview', toggle = True)
 
         col = box.column(align = True)
         row = col.row()
@@ -596,18 +1136,19 @@ class MCUTTER_OT_update(bpy.types.Operator):
             col.enabled = self.frame
             col.prop(self, 'frame_size')
             col = split.column()
-            col.enabled = self.frame and (self.cutter_profile != 'Rectangle')
+            col.enabled = self.frame and prof.curve
             col.prop(self, 'frame_curve', toggle = True)
-            if self.cutter_profile == 'Wave':
+            if prof.props:
                 col = box.column(align = True)
-                row = col.row()
-                split = row.split()
-                split.prop(self, 'wave_flip')
-                split.prop(self, 'wave_amp')
-                row = col.row()
-                split = row.split()
-                split.prop(self, 'wave_freq')
-                split.prop(self, 'wave_phase')
+                for i in range(0, len(prof.props), 2):
+                    row = col.row()
+                    split = row.split()
+                    for name in prof.props[i:i + 2]:
+                        if self.bl_rna.properties[name].type == 'STRING':
+                            split.prop_search(self, name, context.scene, 
+                                                'objects')
+                        else:
+                            split.prop(self, name)
 
         col = box.column(align = True)
         row = col.row()
@@ -620,11 +1161,13 @@ class MCUTTER_OT_update(bpy.types.Operator):
             row = col.row()
             split = row.split()
             col = split.column()
-            col.enabled = (self.cutter_profile != 'Rectangle')
+            col.enabled = prof.res
             col.prop(self, 'cutter_res')
             col = split.column()
             col.enabled = self.frame_curve and self.frame
             col.prop(self, 'frame_res')            
+            row = box.row()
+            row.prop(self, 'cutter_validate', expand = True)
             col = box.column(align = True)
             col.label(text = 'Bevel')
             row = col.row(align = True)
@@ -699,6 +1242,7 @@ class MCUTTER_OT_update(bpy.types.Operator):
                 split.enabled = self.radial
                 split.prop(self, 'radial_offset')
                 split.prop(self, 'radial_offset_symm')
+                split.prop(self, 'radial_merge', toggle = True)
             else:
                 for mod in self.arr_coll:
                     col = box.column(align = True)
@@ -708,431 +1252,152 @@ class MCUTTER_OT_update(bpy.types.Operator):
                     row = col.row()
                     row.prop(mod, 'offset')
 
-    def cutter_get(self, name, uid, target, coll):
-        found = None        
-        for ob in coll.objects:
-            if (ob.keys() and ob.get(name) and (ob[name] == uid) and 
-                (ob.type == 'MESH') and (ob is not target)):
-                found = ob
-                break
-        return found
-
-    def cutter_transform(self, cutter, target):
+    def stage_hashes(self, target, outline):
+        values = {stage: [] for stage in STAGES + (STAGE_SESSION,)}
+        for kind in ('CUTTER', 'TARGET'):
+            for key, is_array in settings_schema(kind):
+                if key in STAGE_DISPLAY:
+                    continue
+                value = getattr(self, key)
+                values[stage_of(kind, key)].append(
+                                        tuple(value) if is_array else value)
+        values['transform'].append([tuple(r) for r in target.matrix_world])
+        values['cutter_mods'] += [(arr.count, tuple(arr.offset)) 
+                                    for arr in self.arr_coll]
+        if outline is not None:
+            values['geometry'].append(outline.tobytes())
+        return {stage: values_hash(v) for stage, v in values.items()}
+
+    def stages_dirty(self, session, item, hashes, target, cutter):
+        old = json.loads(item.stage_hashes) if item.stage_hashes else {}
+        dirty = {stage for stage in STAGES if hashes[stage] != old.get(stage)}
+        if item.frozen or item.previewed or not cutter.data.polygons:
+            # mesh or modifiers are not what the stored hashes describe
+            dirty |= {'geometry', 'cutter_mods'}
+        if ((hashes[STAGE_SESSION] != session.stage_hash) or 
+                (target.modifiers.get('Bevel') is None)):
+            dirty.add(STAGE_SESSION)
+        return dirty
+
+    def cutter_placement(self, target):
         c_rot = self.cutter_rot.to_quaternion()
         c_loc = self.cutter_pos
         t_loc, t_rot, t_sca = target.matrix_world.decompose()
         rot = (t_rot @ c_rot) if self.rot_local else c_rot
+        loc = (t_rot @ c_loc + t_loc) if self.pos_local else c_loc
+        return loc, rot
+
+    def cutter_transform(self, cutter, target):
+        loc, rot = self.cutter_placement(target)
         cutter.rotation_mode = 'XYZ'
         cutter.rotation_euler = rot.to_euler()
-        loc = (t_rot @ c_loc + t_loc) if self.pos_local else c_loc
         cutter.location = loc
 
-    def radial_rotation(self, steps):
-        da = self.radial_angle
-        offset = self.radial_offset
-        radius = self.radial_radius
-        if self.radial_offset_symm:
-            dv = [-offset if i%2 else offset for i in range(steps)]
-        else:
-            dv = [offset * i for i in range(steps)]
-        if self.radial_axis == 'X':
-            coords = [Vector((dv[i], radius * math.cos(i * da), 
-                    radius * math.sin(i * da))) for i in range(steps)]
-            axis = Vector((1, 0, 0))
-        elif self.radial_axis == 'Y':
-            coords = [Vector((radius * math.cos(i * da), dv[i], 
-                    radius * math.sin(i * da))) for i in range(steps)]
-            axis = Vector((0, -1, 0)) 
-        else:
-            coords = [Vector((radius * math.cos(i * da), 
-                    radius * math.sin(i * da), dv[i])) for i in range(steps)]
-            axis = Vector((0, 0, 1))
-        rot = [Quaternion(axis, i * da) for i in range(steps)]
-        return coords, rot
-
-    def p_cuboid(self, rad):
-        return [Vector((rad[0], -rad[1], -rad[2])), 
-                Vector((rad[0], -rad[1], rad[2])), 
-                Vector((-rad[0], -rad[1], rad[2])), 
-                Vector((-rad[0], -rad[1], -rad[2])),
-                Vector((rad[0], rad[1], -rad[2])), 
-                Vector((rad[0], rad[1], rad[2])), 
-                Vector((-rad[0], rad[1], rad[2])), 
-                Vector((-rad[0], rad[1], -rad[2]))]
-
-    def p_cuboid_frame(self, rad_a, rad_b):
-        y = rad_a[1]
-        return [Vector((rad_b[0], -y, -rad_b[2])), 
-                Vector((rad_b[0], y, -rad_b[2])), 
-                Vector((rad_a[0], y, -rad_a[2])), 
-                Vector((rad_a[0], -y, -rad_a[2])),
-                Vector((rad_b[0], -y, rad_b[2])), 
-                Vector((rad_b[0], y, rad_b[2])), 
-                Vector((rad_a[0], y, rad_a[2])), 
-                Vector((rad_a[0], -y, rad_a[2])),
-                Vector((-rad_b[0], -y, rad_b[2])), 
-                Vector((-rad_b[0], y, rad_b[2])), 
-                Vector((-rad_a[0], y, rad_a[2])), 
-                Vector((-rad_a[0], -y, rad_a[2])),
-                Vector((-rad_b[0], -y, -rad_b[2])), 
-                Vector((-rad_b[0], y, -rad_b[2])), 
-                Vector((-rad_a[0], y, -rad_a[2])), 
-                Vector((-rad_a[0], -y, -rad_a[2]))]
-
-    def cuboid_add_faces(self, bm, verts):
-        for i in range(3):
-            bm.faces.new([verts[i], verts[i + 4], verts[i + 5], verts[i + 1]])
-        bm.faces.new([verts[4], verts[0], verts[3], verts[7]])
-        bm.faces.new(verts[:4])
-        bm.faces.new(verts[4:][::-1])
-
-    def cuboid_frame_add_faces(self, bm, verts):
-        for i in range(3):
-            loop = i * 4
-            for j in range(3):
-                bm.faces.new((verts[loop + j], verts[loop + j + 1], 
-                            verts[loop + j + 5], verts[loop + j + 4]))
-            bm.faces.new((verts[loop], verts[loop + 4], verts[loop + 7], 
-                            verts[loop + 3]))
-        for i in range(1, 4):
-            bm.faces.new([verts[i], verts[i - 1], verts[i - 5], verts[i - 4]])
-        bm.faces.new([verts[0], verts[3], verts[-1], verts[-4]])
-
-    def mesh_update_rect_plain(self, bm, radii):
-        coords = self.p_cuboid(radii)
-        verts = [bm.verts.new(co) for co in coords]
-        self.cuboid_add_faces(bm, verts)
-
-    def mesh_update_rect_radial(self, bm, radii):
-        steps = self.radial_steps
-        coords = self.p_cuboid(radii)
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.cuboid_add_faces(bm, verts)
-
-    def mesh_update_rect_frame(self, bm, radii, f_rad):
-        coords = self.p_cuboid_frame(radii, (radii[0] + f_rad, 0, 
-                                        radii[2] + f_rad))
-        verts = [bm.verts.new(co) for co in coords]
-        self.cuboid_frame_add_faces(bm, verts)
-
-    def mesh_update_rect_radial_frame(self, bm, radii, f_rad):
-        steps = self.radial_steps
-        coords = self.p_cuboid_frame(radii, (radii[0] + f_rad, 0, 
-                                        radii[2] + f_rad))
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.cuboid_frame_add_faces(bm, verts)
-
-    def cutter_mesh_update_rectangle(self, me):
-        radii = [self.cutter_size[i] / 2 for i in range(3)]
-        f_rad = self.frame_size / 2
-        steps = self.radial_steps
-        bm = bmesh.new(use_operators = False)
-        if self.radial and self.frame:
-            self.mesh_update_rect_radial_frame(bm, radii, f_rad)
-        elif self.frame:
-            self.mesh_update_rect_frame(bm, radii, f_rad)
-        elif self.radial:
-            self.mesh_update_rect_radial(bm, radii)
-        else:
-            self.mesh_update_rect_plain(bm, radii)  
-        bm.to_mesh(me)
+    def cutter_matrix(self, cutter, target):
+        # the matrix cutter_transform would give, object left untouched
+        loc, rot = self.cutter_placement(target)
+        return (Matrix.Translation(loc) @ rot.to_matrix().to_4x4() @ 
+                Matrix.Diagonal(cutter.scale).to_4x4())
+
+    def mesh_write(self, me, co, loops, totals):
+        import numpy as np
+        starts = np.zeros(len(totals), dtype = np.int32)
+        np.cumsum(totals[:-1], out = starts[1:])
+        me.clear_geometry()
+        me.vertices.add(len(co))
+        me.vertices.foreach_set('co', co.astype(np.float32).ravel())
+        me.loops.add(len(loops))
+        me.loops.foreach_set('vertex_index', loops)
+        me.polygons.add(len(totals))
+        me.polygons.foreach_set('loop_start', starts)
+        me.polygons.foreach_set('loop_total', totals)
+        me.update(calc_edges = True)
+
+    def mesh_validate(self, me):
+        # cheap array checks, run before the cutter reaches any boolean; 
+        # -> (radial copies left, stacked copies to merge)
+        steps = self.radial_steps if self.radial else 1
+        if (self.cutter_validate == 'OFF') or (not me.vertices):
+            return steps, False
+        from . import validate
+        result = validate.mesh_check(me, steps, validate.DIST)
+        msg = validate.check_message(result)
+        if not msg:
+            return steps, False
+        if self.cutter_validate != 'FIX':
+            self.report({'WARNING'}, f'MCutter: {msg}')
+            return steps, False
+        self.mesh_fix(me, result, validate.DIST)
+        # stacked copies (zero radius) are fixed by the radial union
+        if result['stacked']:
+            msg += ' (merged)'
+        self.report({'INFO'}, f'MCutter fixed: {msg}')
+        return steps - len(result['duplicate']), result['stacked'] > 0
+
+    def mesh_fix(self, me, result, dist):
+        with memory.bmesh_pooled() as bm:
+            bm.from_mesh(me)
+            bm.verts.ensure_lookup_table()
+            n = result['shell_size']
+            shells = [bm.verts[i:i + n] for i in range(0, len(bm.verts), n)]
+            dup = set(result['duplicate'])
+            drop = [v for i in dup for v in shells[i]]
+            if drop:
+                bmesh.ops.delete(bm, geom = drop, context = 'VERTS')
+            for i, shell in enumerate(shells):
+                if i not in dup:
+                    bmesh.ops.remove_doubles(bm, verts = shell, dist = dist)
+            bmesh.ops.dissolve_degenerate(bm, dist = dist, 
+                                            edges = bm.edges[:])
+            bm.to_mesh(me)
         me.update()
-        bm.free()
-
-    def p_ellipse(self, rad, res):
-        da = 2 * math.pi / res
-        return [Vector((rad[0] * math.cos(i * da), 0, 
-                rad[2] * math.sin(i * da))) for i in range(res)]
-
-    def f_ellipse(self, rad, res):
-        da = 2 * math.pi / res
-        return [Vector((0, rad[1] * math.cos(i * da), 
-                rad[2] * math.sin(i * da))) for i in range(res)]
-
-    def cylinder_coords(self, radii, res):
-        coords = self.p_ellipse(radii, res)
-        vy = Vector((0, radii[1], 0))
-        return [co - vy for co in coords] + [co + vy for co in coords]
-
-    def cylinder_add_faces(self, bm, verts, res):
-        for i in range(res - 1):
-            bm.faces.new([verts[i], verts[i + res], verts[i + res + 1], 
-                            verts[i + 1]])
-        bm.faces.new([verts[res], verts[0], verts[res - 1], verts[-1]])
-        bm.faces.new(verts[:res])
-        bm.faces.new(verts[res:][::-1])
-
-    def cylinder_frame_coords(self, radii, res, f_rad):
-        path = self.p_ellipse((radii[0] + f_rad, 0, radii[2] + f_rad), res)
-        ring = [
-                Vector((0, radii[1], -f_rad)), Vector((0, radii[1], f_rad)), 
-                Vector((0, -radii[1], f_rad)), Vector((0, -radii[1], -f_rad))
-                ]
-        axis = Vector((0, -1, 0))
-        hpi = math.pi / 2
-        da = 2 * math.pi / res
-        return [Quaternion(axis, hpi + i * da) @ ring[j] + path[i] 
-                            for i in range(res) for j in range(4)]
-
-    def cylinder_frame_add_faces(self, bm, verts, res):
-        for i in range(res - 1):
-            loop = i * 4
-            for j in range(3):
-                bm.faces.new((verts[loop + j], verts[loop + j + 1], 
-                            verts[loop + j + 5], verts[loop + j + 4]))
-            bm.faces.new((verts[loop], verts[loop + 4], verts[loop + 7], 
-                        verts[loop + 3]))
-        for i in range(1, 4):
-            bm.faces.new([verts[i], verts[i - 1], verts[i - 5], verts[i - 4]])
-        bm.faces.new([verts[0], verts[3], verts[-1], verts[-4]])
-
-    def torus_coords(self, radii, res, f_rad, f_res):
-        path = self.p_ellipse((radii[0] + f_rad, 0, radii[2] + f_rad), res)
-        ring = self.f_ellipse((0, radii[1], f_rad), f_res)
-        axis = Vector((0, -1, 0))
-        hpi = math.pi / 2
-        da = 2 * math.pi / res
-        return [Quaternion(axis, hpi + i * da) @ ring[j] + path[i] 
-                            for i in range(res) for j in range(f_res)]
-
-    def torus_add_faces(self, bm, verts, res, f_res):
-        for i in range(res - 1):
-            loop = i * f_res
-            for j in range(f_res - 1):
-                bm.faces.new((verts[loop + j], verts[loop + j + 1], 
-                            verts[loop + f_res + j + 1], 
-                            verts[loop + f_res + j]))
-            bm.faces.new((verts[loop], verts[loop + f_res], 
-                        verts[loop + 2 * f_res - 1], 
-                        verts[loop + f_res - 1]))
-        for i in range(1, f_res):
-            bm.faces.new([verts[i], verts[i - 1], verts[-f_res - 1 + i], 
-                        verts[-f_res + i]])
-        bm.faces.new([verts[0], verts[f_res - 1], verts[-1], verts[-f_res]])
-
-    def mesh_update_elli_plain(self, bm, radii):
-        res = self.cutter_res
-        coords = self.cylinder_coords(radii, res)
-        verts = [bm.verts.new(co) for co in coords]
-        self.cylinder_add_faces(bm, verts, res)
-
-    def mesh_update_elli_radial(self, bm, radii):
-        res = self.cutter_res
-        steps = self.radial_steps
-        coords = self.cylinder_coords(radii, res)
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.cylinder_add_faces(bm, verts, res)
-
-    def mesh_update_elli_frame(self, bm, radii, f_rad):
-        res = self.cutter_res
-        coords = self.cylinder_frame_coords(radii, res, f_rad)
-        verts = [bm.verts.new(co) for co in coords]
-        self.cylinder_frame_add_faces(bm, verts, res)
-        
-    def mesh_update_elli_radial_frame(self, bm, radii, f_rad):
-        res = self.cutter_res
-        steps = self.radial_steps
-        coords = self.cylinder_frame_coords(radii, res, f_rad)
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.cylinder_frame_add_faces(bm, verts, res)
-
-    def mesh_update_elli_frame_curve(self, bm, radii, f_rad):
-        res = self.cutter_res
-        f_res = self.frame_res
-        coords = self.torus_coords(radii, res, f_rad, f_res)
-        verts = [bm.verts.new(co) for co in coords]
-        self.torus_add_faces(bm, verts, res, f_res)
-            
-    def mesh_update_elli_radial_frame_curve(self, bm, radii, f_rad):
-        res = self.cutter_res
-        f_res = self.frame_res
-        steps = self.radial_steps
-        coords = self.torus_coords(radii, res, f_rad, f_res)
-        coords_rad, rot = self.radial_rotation(steps) 
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.torus_add_faces(bm, verts, res, f_res)
-
-    def cutter_mesh_update_ellipse(self, me):
-        radii = [self.cutter_size[i] / 2 for i in range(3)]
-        f_rad = self.frame_size / 4
-        bm = bmesh.new(use_operators = False)
-        if self.radial and self.frame_curve and self.frame:
-            self.mesh_update_elli_radial_frame_curve(bm, radii, f_rad)
-        elif self.frame_curve and self.frame:
-            self.mesh_update_elli_frame_curve(bm, radii, f_rad)
-        elif self.radial and self.frame:
-            self.mesh_update_elli_radial_frame(bm, radii, f_rad)
-        elif self.frame:
-            self.mesh_update_elli_frame(bm, radii, f_rad)
-        elif self.radial:
-            self.mesh_update_elli_radial(bm, radii)
-        else:
-            self.mesh_update_elli_plain(bm, radii)
-        bm.to_mesh(me)
-        me.update()
-        bm.free()
-
-    def p_wave_ring(self, path, path_res, ring, ring_res):
-        path_pad = [path[0]] + path + [path[-1]]
-        rot = [(path_pad[i + 1] - path_pad[i - 1]).to_track_quat('X', 'Z') 
-                    for i in range(1, path_res + 1)]
-        return [rot[i] @ ring[j] + path[i] for i in range(path_res) 
-                    for j in range(ring_res)]
-
-    def p_wave(self, rad, res):
-        amp = self.wave_amp
-        freq = self.wave_freq
-        phase = self.wave_phase
-        dx = 2 * rad[0] / (res - 1)
-        dw = freq * 2 * math.pi / (res - 1)
-        return [Vector((-rad[0] + i * dx, 0, 
-                        rad[2] + amp * math.sin(i * dw + phase))) 
-                            for i in range(res)]
-
-    def wave_wall_coords(self, radii, res):
-        coords = self.p_wave(radii, res)
-        rev = Quaternion(Vector((1, 0, 0)), math.pi)
-        coords = coords + [rev @ co for co in coords][::-1]
-        loop = len(coords)
-        vy = Vector((0, radii[1], 0))
-        coords = [co - vy for co in coords]
-        coords += [co + 2 * vy for co in coords]
-        if self.wave_flip:
-            y_fix = Quaternion(Vector((0, 1, 0)), math.pi / 2)
-            coords = [y_fix @ co for co in coords]
-        return coords, loop
-        
-    def wave_wall_add_faces(self, bm, verts, loop):
-        for i in range(loop - 1):
-            bm.faces.new([verts[i + 1], verts[i + loop + 1], 
-                        verts[i + loop], verts[i]])
-        bm.faces.new([verts[-1], verts[loop - 1], verts[0], verts[loop]])
-        bm.faces.new(verts[:loop][::-1])
-        bm.faces.new(verts[loop:])
-        
-    def wave_tube_flat_coords(self, radii, res, f_rad):
-        coords_p = self.p_wave((radii[0], 0, radii[2] + f_rad), res)    
-        coords_f = [Vector((0, radii[1], -f_rad)), 
-                    Vector((0, radii[1], f_rad)), 
-                    Vector((0, -radii[1], f_rad)), 
-                    Vector((0, -radii[1], -f_rad))]
-        coords = self.p_wave_ring(coords_p, res, coords_f, 4)
-        rev = Quaternion(Vector((1, 0, 0)), math.pi)
-        if self.wave_flip:
-            y_fix = Quaternion(Vector((0, 1, 0)), math.pi / 2)
-            coords = [y_fix @ co for co in coords]
-            rev = Quaternion(Vector((0, 0, 1)), math.pi)
-        return coords, rev
-
-    def wave_tube_round_coords(self, radii, res, f_rad, f_res):
-        coords_p = self.p_wave((radii[0], 0, radii[2] + f_rad), res)
-        coords_f = self.f_ellipse((0, radii[1], f_rad), f_res)
-        coords = self.p_wave_ring(coords_p, res, coords_f, f_res)
-        rev = Quaternion(Vector((1, 0, 0)), math.pi)
-        if self.wave_flip:
-            y_fix = Quaternion(Vector((0, 1, 0)), math.pi / 2)
-            coords = [y_fix @ co for co in coords]
-            rev = Quaternion(Vector((0, 0, 1)), math.pi)
-        return coords, rev
-
-    def wave_tube_add_faces(self, bm, verts, res, f_res):
-        bm.faces.new(verts[:f_res][::-1])
-        bm.faces.new(verts[(res - 1) * f_res:])
-        for i in range(res - 1):
-            loop = i * f_res
-            for j in range(f_res - 1):
-                bm.faces.new((verts[loop + j], verts[loop + j + 1], 
-                            verts[loop + f_res + j + 1], 
-                            verts[loop + f_res + j]))
-            bm.faces.new((verts[loop], verts[loop + f_res], 
-                            verts[loop + 2 * f_res - 1], 
-                            verts[loop + f_res - 1]))
-
-    def mesh_update_wave_plain(self, bm, radii, res):
-        coords, loop = self.wave_wall_coords(radii, res)
-        verts = [bm.verts.new(co) for co in coords]
-        self.wave_wall_add_faces(bm, verts, loop)
-
-    def mesh_update_wave_radial(self, bm, radii, res):
-        steps = self.radial_steps
-        coords, loop = self.wave_wall_coords(radii, res)
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.wave_wall_add_faces(bm, verts, loop)
-
-    def mesh_update_wave_frame(self, bm, radii, res, f_rad):
-        coords, rev = self.wave_tube_flat_coords(radii, res, f_rad)
-        verts = [bm.verts.new(co) for co in coords]
-        self.wave_tube_add_faces(bm, verts, res, 4)
-        verts = [bm.verts.new(rev @ co) for co in coords]
-        self.wave_tube_add_faces(bm, verts, res, 4)
-
-    def mesh_update_wave_radial_frame(self, bm, radii, res, f_rad):
-        steps = self.radial_steps
-        coords, rev = self.wave_tube_flat_coords(radii, res, f_rad)
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.wave_tube_add_faces(bm, verts, res, 4)
-            verts = [bm.verts.new(rot[i] @ (rev @ co) + coords_rad[i]) 
-                        for co in coords]    
-            self.wave_tube_add_faces(bm, verts, res, 4)
-        
-    def mesh_update_wave_frame_curve(self, bm, radii, res, f_rad):
-        f_res = self.frame_res
-        coords, rev = self.wave_tube_round_coords(radii, res, f_rad, f_res)
-        verts = [bm.verts.new(co) for co in coords]
-        self.wave_tube_add_faces(bm, verts, res, f_res)
-        verts = [bm.verts.new(rev @ co) for co in coords]    
-        self.wave_tube_add_faces(bm, verts, res, f_res)
-        
-    def mesh_update_wave_radial_frame_curve(self, bm, radii, res, f_rad):
-        f_res = self.frame_res
-        steps = self.radial_steps
-        coords, rev = self.wave_tube_round_coords(radii, res, f_rad, f_res)
-        coords_rad, rot = self.radial_rotation(steps)
-        for i in range(steps):
-            verts = [bm.verts.new(rot[i] @ co + coords_rad[i]) for co in coords]
-            self.wave_tube_add_faces(bm, verts, res, f_res)
-            verts = [bm.verts.new(rot[i] @ (rev @ co) + coords_rad[i]) 
-                        for co in coords]
-            self.wave_tube_add_faces(bm, verts, res, f_res) 
-
-    def cutter_mesh_update_wave(self, me):
-        radii = [self.cutter_size[i] / 2 for i in range(3)]
-        res = self.cutter_res + 1
-        f_rad = self.frame_size / 4
-        bm = bmesh.new(use_operators = False)
-        if self.radial and self.frame_curve and self.frame:
-            self.mesh_update_wave_radial_frame_curve(bm, radii, res, f_rad)
-        elif self.frame_curve and self.frame:
-            self.mesh_update_wave_frame_curve(bm, radii, res, f_rad)
-        elif self.radial and self.frame:
-            self.mesh_update_wave_radial_frame(bm, radii, res, f_rad)
-        elif self.frame:
-            self.mesh_update_wave_frame(bm, radii, res, f_rad)
-        elif self.radial:
-            self.mesh_update_wave_radial(bm, radii, res)
+
+    def radial_union(self, coll, me, name, steps):
+        # once per rebuild: the target booleans then get one closed volume 
+        # instead of many overlapping shells
+        from . import validate
+        shells = validate.mesh_shells(me, steps)
+        if len(shells) < 2:
+            return
+        meshes = [memory.mesh_tag(self.shell_mesh(co, faces), name) 
+                    for co, faces in shells]
+        carrier = bpy.data.objects.new('MCutter_union', meshes[0])
+        operand = bpy.data.objects.new('MCutter_union_op', meshes[1])
+        coll.objects.link(carrier)
+        coll.objects.link(operand)
+        operand.hide_viewport = True
+        mod = carrier.modifiers.new(name = 'Union', type = 'BOOLEAN')
+        mod.operation = 'UNION'
+        if hasattr(mod, 'solver'):
+            mod.solver = 'EXACT'
+        mod.object = operand
+        for shell in meshes[1:]:
+            operand.data = shell
+            dg = bpy.context.evaluated_depsgraph_get()
+            me_new = bpy.data.meshes.new_from_object(carrier.evaluated_get(dg))
+            memory.mesh_tag(me_new, name)
+            me_old = carrier.data
+            carrier.data = me_new
+            bpy.data.meshes.remove(me_old)
+        me_union = carrier.data
+        bpy.data.objects.remove(carrier)
+        bpy.data.objects.remove(operand)
+        for shell in meshes[1:]:
+            bpy.data.meshes.remove(shell)
+        if me_union.polygons:
+            with memory.bmesh_pooled() as bm:
+                bm.from_mesh(me_union)
+                bm.to_mesh(me)
+            me.update()
         else:
-            self.mesh_update_wave_plain(bm, radii, res)
-        bm.to_mesh(me)
-        me.update()
-        bm.free()
+            self.report({'WARNING'}, 'MCutter: radial merge failed')
+        bpy.data.meshes.remove(me_union)
 
-    def mesh_options_update(self, me, smooth_shade, smooth_norm):
-        smooth_lst = [smooth_shade] * len(me.polygons)
-        me.polygons.foreach_set("use_smooth", smooth_lst)
-        me.use_auto_smooth = smooth_norm
+    def shell_mesh(self, co, faces):
+        me = bpy.data.meshes.new('MCutter_shell')
+        me.from_pydata(co.tolist(), [], [f.tolist() for f in faces])
+        me.update()
+        return me
 
     def cutter_mods_update(self, cutter):
         for arr in self.arr_coll:
@@ -1164,19 +1429,15 @@ class MCUTTER_OT_update(bpy.types.Operator):
         mod.limit_method = 'ANGLE'
         mod.angle_limit = math.pi / 6
         mod.show_expanded = False
-        self.modifier_move_to_top(cutter, 'Bevel', 'BEVEL')
+        modifier_move_to_top(cutter, 'Bevel', 'BEVEL')
 
     def target_mods_update(self, target, mod_name, cutter):
-        found = False
-        mod = target.modifiers.get(mod_name)
-        if mod and mod.type == 'BOOLEAN':
-            found = True
-        if not found:
-            mod = target.modifiers.new(name = mod_name, type = 'BOOLEAN')    
-        mod.operation = self.cutter_bool_op
-        mod.object = cutter
-        mod.show_viewport = self.cutter_effect
-        mod.show_expanded = False
+        target_bool_update(target, mod_name, cutter, self.cutter_bool_op, 
+                            self.cutter_effect, solver_get(self.cutter_solver, 
+                                                        self.target_solver))
+        target_tail_order(target)
+
+    def session_mods_update(self, scene, session, target):
         found = False
         mod = target.modifiers.get('Bevel')
         if mod and mod.type == 'BEVEL':
@@ -1192,22 +1453,57 @@ class MCUTTER_OT_update(bpy.types.Operator):
         mod.limit_method = 'ANGLE'
         mod.angle_limit = math.pi / 6
         mod.show_expanded = False
-        self.modifier_move_to_bottom(target, 'Bevel', 'BEVEL')
-
-    def modifier_move_to_top(self, ob, name, type):
-        mod = ob.modifiers.get(name)
-        if mod and mod.type == type:
-            bpy.context.view_layer.objects.active = ob
-            while ob.modifiers.find(name) != 0:
-                bpy.ops.object.modifier_move_up(modifier = name)
-
-    def modifier_move_to_bottom(self, ob, name, type):
-        mod = ob.modifiers.get(name)
-        if mod and mod.type == type:
-            bpy.context.view_layer.objects.active = ob
-            id_last = len(ob.modifiers) - 1
-            while ob.modifiers.find(name) < id_last:
-                bpy.ops.object.modifier_move_down(modifier = name)
+        self.symmetry_update(target)
+        self.solver_sync(scene, session, target)
+        target_tail_order(target)
+
+    def solver_sync(self, scene, session, target):
+        # cutters on the session solver follow it, on linked targets too
+        solver = solver_get('DEFAULT', self.target_solver)
+        for item in session.ul_coll:
+            if item.cutter_solver != 'DEFAULT':
+                continue
+            for ob in [target] + [scene.objects.get(link.name) 
+                                    for link in item.links]:
+                mod = ob.modifiers.get(item.p_name) if ob else None
+                if (mod and (mod.type == 'BOOLEAN') and 
+                        hasattr(mod, 'solver') and (mod.solver != solver)):
+                    mod.solver = solver
+
+    def symmetry_update(self, target):
+        # one mirror after all the booleans: symmetric cuts cost one set 
+        # of booleans instead of two
+        mod = target.modifiers.get('Symmetry')
+        if mod and mod.type != 'MIRROR':
+            mod = None
+        if not any(self.target_symmetry):
+            if mod:
+                target.modifiers.remove(mod)
+            return
+        if mod is None:
+            mod = target.modifiers.new(name = 'Symmetry', type = 'MIRROR')
+        mod.use_axis = self.target_symmetry
+        mod.use_bisect_axis = self.target_symmetry
+        mod.use_mirror_merge = True
+        mod.show_expanded = False
+
+    def links_update(self, scene, props, item, cutter):
+        # one cutter mesh, several targets: only the modifiers need syncing
+        for link in item.links:
+            target = scene.objects.get(link.name)
+            idx, session = session_find(props, link.name)
+            if (target is None) or (session is None):
+                continue
+            show = ((idx == props.session_idx) and 
+                    session.target_bool_effects and self.cutter_effect)
+            target_bool_update(target, item.p_name, cutter, 
+                                self.cutter_bool_op, show, 
+                                solver_get(self.cutter_solver, 
+                                            self.target_solver))
+            target_tail_order(target)
+        if item.links:
+            bpy.context.view_layer.objects.active = scene.objects.get(
+                                        session_get(props).target_name)
 
 class MCUTTER_OT_hide_cutters(bpy.types.Operator):
     bl_label = "Hide cutters"
@@ -1217,41 +1513,187 @@ class MCUTTER_OT_hide_cutters(bpy.types.Operator):
     
     def execute(self, context):
         scene = context.scene
-        coll = scene.collection.children.get(scene.ptmc_props.coll_name)
+        session = session_get(scene.ptmc_props)
+        coll = scene.collection.children.get(session.coll_name)
         for ob in coll.objects:
             ob.hide_viewport = True
         return {'FINISHED'}
 
+class MCUTTER_OT_memory_report(bpy.types.Operator):
+    bl_label = "Memory"
+    bl_idname = "mcutter.memory_report"
+    bl_description = "Report MCutter mesh count, size and orphans"
+    bl_options = {'REGISTER', 'INTERNAL'}
+    
+    def execute(self, context):
+        name = context.scene.ptmc_props.base_name
+        self.report({'INFO'}, memory.report_message(memory.memory_report(name)))
+        return {'FINISHED'}
+
+class MCUTTER_OT_purge_orphans(bpy.types.Operator):
+    bl_label = "Purge Orphans"
+    bl_idname = "mcutter.purge_orphans"
+    bl_description = "Remove unused MCutter meshes [other data is not affected]"
+    bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
+    
+    def execute(self, context):
+        count = memory.orphans_purge(context.scene.ptmc_props.base_name)
+        self.report({'INFO'}, f'MCutter: {count} orphan meshes removed')
+        return {'FINISHED'}
+
 class MCUTTER_OT_finalize(bpy.types.Operator):
     bl_label = "Finalize"
     bl_idname = "mcutter.finalize"
     bl_description = "Apply all modifiers to target mesh object"
     bl_options = {'REGISTER', 'INTERNAL', 'UNDO'}
 
+    chunk: bpy.props.IntProperty(
+        name = 'Chunk', description = 'Modifiers applied per step', 
+        default = 1, min = 1
+        )
+
     def invoke(self, context, event):
-        return context.window_manager.invoke_confirm(self, event)
+        return close_invoke(self, context, event)
+
+    def draw(self, context):
+        close_draw(self, self.layout)
+        self.layout.prop(self, 'chunk')
     
     def execute(self, context):
         scene = context.scene
         props = scene.ptmc_props
-        target = scene.objects.get(props.target_name)
+        session = session_get(props)
+        if any(item.previewed for item in session.ul_coll):
+            bpy.ops.mcutter.preview_commit('EXEC_DEFAULT')
+        target = scene.objects.get(session.target_name)
+        if not target.modifiers:
+            return self.finish(context)
+        self.stream_begin(context, props, target)
+        if context.window is None:
+            # headless: no events to wait for, apply everything now
+            while self.stream_step(context):
+                pass
+            return self.finish(context)
+        wm = context.window_manager
+        wm.progress_begin(0, len(self.mods))
+        self.timer = wm.event_timer_add(0.01, window = context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.stream_cancel(context)
+            self.report({'INFO'}, 'Finalize cancelled')
+            return {'CANCELLED'}
+        if event.type == 'TIMER':
+            if context.scene.objects.get(self.target_name) is None:
+                self.modal_end(context)
+                self.report({'WARNING'}, 'MCutter target not found')
+                return {'CANCELLED'}
+            if self.stream_step(context):
+                context.window_manager.progress_update(self.done)
+                context.workspace.status_text_set(
+                    f'MCutter finalize: {self.done}/{len(self.mods)} '
+                    'modifiers applied  (Esc to cancel)')
+                return {'RUNNING_MODAL'}
+            self.modal_end(context)
+            return self.finish(context)
+        if event.type in {'MOUSEMOVE', 'MIDDLEMOUSE', 'WHEELUPMOUSE', 
+                        'WHEELDOWNMOUSE', 'TRACKPADPAN', 'TRACKPADZOOM'}:
+            return {'PASS_THROUGH'}
+        return {'RUNNING_MODAL'}
+
+    def modal_end(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def finish(self, context):
+        scene = context.scene
+        props = scene.ptmc_props
+        session = session_get(props)
+        target = scene.objects.get(session.target_name)
         if target.modifiers:
-            self.modifier_apply_all(context, target)
-        temps_remove(scene, props.coll_name)
-        props.ul_coll.clear()
+            self.stream_commit(target)
+        temps_remove(scene, session.coll_name)
+        if session_close(context, props):
+            self.report({'WARNING'}, 'Shared cutters removed from targets')
         props.target_old_mods_remove = True
         props.target_apply_scale = True
-        context.area.tag_redraw()
+        if context.area:
+            context.area.tag_redraw()
         return {'FINISHED'}
 
-    def modifier_apply_all(self, context, ob):
+    def stream_begin(self, context, props, target):
+        # applied modifiers are only hidden until the end, so cancelling 
+        # restores the original mesh and the modifier flags; modifiers hidden 
+        # at start (cutter/session Effects off) are not applied, commit 
+        # discards them
+        self.target_name = target.name
+        self.mesh_name = target.data.name
+        self.mods = [mod.name for mod in target.modifiers if mod.show_viewport]
+        self.shown = {mod.name: mod.show_viewport for mod in target.modifiers}
+        self.solvers = self.solvers_final(props, target)
+        self.done = 0
+        self.hidden = target.hide_viewport
+        target.hide_viewport = False
+
+    def stream_step(self, context):
+        if self.done >= len(self.mods):
+            return False
+        target = context.scene.objects.get(self.target_name)
+        names = set(self.mods[self.done:self.done + self.chunk])
+        for mod in target.modifiers:
+            mod.show_viewport = mod.name in names
         dg = context.evaluated_depsgraph_get()
-        ob_eval = ob.evaluated_get(dg)
-        mesh_from_eval = bpy.data.meshes.new_from_object(ob_eval)
-        ob.modifiers.clear()
-        me_old = ob.data
-        ob.data = mesh_from_eval
-        bpy.data.meshes.remove(me_old)
+        me_new = bpy.data.meshes.new_from_object(target.evaluated_get(dg))
+        me_old = target.data
+        target.data = me_new
+        if me_old.name != self.mesh_name:
+            bpy.data.meshes.remove(me_old)
+        self.done += len(names)
+        return self.done < len(self.mods)
+
+    def stream_commit(self, target):
+        target.modifiers.clear()
+        me_orig = bpy.data.meshes.get(self.mesh_name)
+        if me_orig and me_orig.users == 0:
+            bpy.data.meshes.remove(me_orig)
+
+    def stream_cancel(self, context):
+        self.modal_end(context)
+        target = context.scene.objects.get(self.target_name)
+        me_orig = bpy.data.meshes.get(self.mesh_name)
+        if (target is None) or (me_orig is None):
+            return
+        me_old = target.data
+        target.data = me_orig
+        if me_old.name != self.mesh_name:
+            bpy.data.meshes.remove(me_old)
+        for mod in target.modifiers:
+            mod.show_viewport = self.shown.get(mod.name, mod.show_viewport)
+            if mod.name in self.solvers:
+                mod.solver = self.solvers[mod.name]
+        target.hide_viewport = self.hidden
+
+    def solvers_final(self, props, target):
+        # the target's booleans may come from its own or shared cutters
+        owners = {}
+        for session in props.sessions:
+            for item in session.ul_coll:
+                if ((session.target_name == target.name) or 
+                    (target.name in item.links)):
+                    owners[item.p_name] = (item, session)
+        solvers = {}
+        for mod in target.modifiers:
+            if ((mod.type == 'BOOLEAN') and hasattr(mod, 'solver') and 
+                (mod.name in owners)):
+                item, session = owners[mod.name]
+                solvers[mod.name] = mod.solver
+                mod.solver = solver_get(item.cutter_solver, 
+                                        session.target_solver, True)
+        return solvers
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
@@ -1264,15 +1706,27 @@ classes = (
     MCUTTER_OT_show_target,
     MCUTTER_OT_add_item,
     MCUTTER_OT_remove_item,
+    MCUTTER_OT_share_item,
+    MCUTTER_OT_unshare_item,
+    MCUTTER_OT_freeze_item,
+    MCUTTER_OT_move_item,
+    MCUTTER_OT_preview_commit,
     MCUTTER_OT_update,
     MCUTTER_OT_hide_cutters,
+    MCUTTER_OT_memory_report,
+    MCUTTER_OT_purge_orphans,
     MCUTTER_OT_finalize,
 )
 
 def register():
     for cls in classes:
+        profiling.wrap(cls)
         bpy.utils.register_class(cls)
 
 def unregister():
+    memory.unregister()
+    preview.unregister()
+    schema.clear()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+        profiling.unwrap(cls)
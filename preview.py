@@ -0,0 +1,132 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import bpy
+from bpy.app.handlers import persistent
+
+COLOR = (1.0, 0.55, 0.1, 1.0)
+# cutter uid -> (world coords, line indices); batches are built when drawn
+overlays = {}
+batches = {}
+handle = []
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    OVERLAYS [ preview cutters: no object, no depsgraph evaluation ]
+# ------------------------------------------------------------------------------
+def overlay_set(uid, co, loops, totals, matrix):
+    from . import geometry
+    overlays[uid] = geometry.preview_lines(co, loops, totals, matrix)
+    batches.pop(uid, None)
+    handlers_add()
+    if not bpy.app.background:
+        handler_add()
+        view3d_redraw()
+
+def overlay_remove(uid = None):
+    if uid is None:
+        overlays.clear()
+        batches.clear()
+    else:
+        overlays.pop(uid, None)
+        batches.pop(uid, None)
+    if not overlays:
+        handler_remove()
+    if not bpy.app.background:
+        view3d_redraw()
+
+def overlay_draw():
+    import gpu
+    from gpu_extras.batch import batch_for_shader
+    # the '3D_' built-in shader names were removed in Blender 4.0
+    shader = gpu.shader.from_builtin('UNIFORM_COLOR' 
+                        if bpy.app.version >= (4, 0, 0) else '3D_UNIFORM_COLOR')
+    shader.bind()
+    shader.uniform_float('color', COLOR)
+    for uid, (co, edges) in overlays.items():
+        batch = batches.get(uid)
+        if batch is None:
+            batch = batch_for_shader(shader, 'LINES', {'pos': co}, 
+                                    indices = edges)
+            batches[uid] = batch
+        batch.draw(shader)
+
+def view3d_redraw():
+    wm = bpy.context.window_manager
+    for window in (wm.windows if wm else ()):
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    HANDLERS
+# ------------------------------------------------------------------------------
+@persistent
+def preview_undo(dummy):
+    # undo/redo can restore items as built: drop their overlays
+    keep = {item.uid for scene in bpy.data.scenes 
+                for session in scene.ptmc_props.sessions 
+                for item in session.ul_coll if item.previewed}
+    for uid in [uid for uid in overlays if uid not in keep]:
+        overlay_remove(uid)
+
+@persistent
+def preview_load(dummy):
+    if overlays:
+        overlay_remove()
+
+handlers = (
+    (bpy.app.handlers.undo_post, preview_undo),
+    (bpy.app.handlers.redo_post, preview_undo),
+    (bpy.app.handlers.load_post, preview_load),
+)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    REGISTER/UNREGISTER [ draw handler only while overlays exist, 
+#                          undo/load handlers added on first use ]
+# ------------------------------------------------------------------------------
+def handler_add():
+    if not handle:
+        handle.append(bpy.types.SpaceView3D.draw_handler_add(
+                        overlay_draw, (), 'WINDOW', 'POST_VIEW'))
+
+def handler_remove():
+    if handle:
+        bpy.types.SpaceView3D.draw_handler_remove(handle.pop(), 'WINDOW')
+
+def handlers_add():
+    for handler_list, func in handlers:
+        if func not in handler_list:
+            handler_list.append(func)
+
+def unregister():
+    for handler_list, func in handlers:
+        if func in handler_list:
+            handler_list.remove(func)
+    overlays.clear()
+    batches.clear()
+    handler_remove()
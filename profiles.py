@@ -0,0 +1,89 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    PROFILES [ geometry.py is imported on first mesh build, not at startup ]
+# ------------------------------------------------------------------------------
+class Profile:
+    """Cutter cross-section; frame, radial and arrays are added generically.
+
+    outline(p) -> (points, directions): closed (x, z) loop; the frame ring 
+        sits on each point, offset along its direction.
+    frame(p, ring, f) -> [shell]: optional, replaces the closed frame sweep.
+    post(p) -> 3x3 matrix or None: optional, applied before radial copies.
+    Hooks are callables, or names of geometry.py functions (the built-in 
+    profiles: numpy and the geometry code load on first use).
+    res: uses the profile segments; curve: supports the curve frame.
+    props: profile options, drawn in pairs under Style options.
+    """
+
+    def __init__(self, name, description, outline, frame = None, 
+                    post = None, res = True, curve = True, props = ()):
+        self.name = name
+        self.description = description
+        self.outline = outline
+        self.frame = frame
+        self.post = post
+        self.res = res
+        self.curve = curve
+        self.props = props
+
+PROFILES = {}
+# unit outlines of Custom profile sources, filled and invalidated by sources.py
+SOURCES = {}
+
+def profile_add(profile):
+    PROFILES[profile.name] = profile
+
+def profile_items():
+    # read once, when ui.py and ops.py build their Profile enums: add 
+    # profiles in this module, before those classes exist
+    return tuple((name, name, prof.description) 
+                    for name, prof in PROFILES.items())
+
+def custom_outline(p):
+    from . import geometry
+    unit = SOURCES.get(p.custom_source)
+    if unit is None:
+        return geometry.rectangle_outline(p)
+    outline = unit * [p.cutter_size[0] / 2, p.cutter_size[2] / 2]
+    return outline, geometry.outline_normals(outline)
+
+profile_add(Profile('Rectangle', 'rectangle profile', 'rectangle_outline', 
+                    res = False, curve = False))
+profile_add(Profile('Ellipse', 'ellipse profile', 'ellipse_outline'))
+profile_add(Profile('Wave', 'wave profile', 'wave_outline', 
+                    frame = 'wave_frame', post = 'wave_post', 
+                    props = ('wave_flip', 'wave_amp', 'wave_freq', 
+                            'wave_phase')))
+profile_add(Profile('Star', 'star profile', 'star_outline', 
+                    props = ('star_ratio',)))
+profile_add(Profile('Noise', 'noise displaced profile', 'noise_outline', 
+                    frame = 'noise_frame', 
+                    props = ('noise_seed', 'noise_scale', 'noise_octaves', 
+                            'noise_amp')))
+profile_add(Profile('Custom', 'curve or mesh outline profile', 
+                    custom_outline, res = False, props = ('custom_source',)))
+
+def cutter_arrays(p):
+    from . import geometry
+    return geometry.cutter_arrays(p, PROFILES[p.cutter_profile])
@@ -0,0 +1,137 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import bpy
+import os
+import time
+
+# MCUTTER_PROFILE=<dir> turns profiling on without touching the preferences, 
+# MCUTTER_PROFILE_MODE=CALL|SESSION picks one file per call or per session
+ENV_DIR = 'MCUTTER_PROFILE'
+ENV_MODE = 'MCUTTER_PROFILE_MODE'
+# session key -> cProfile.Profile, accumulated over the session's calls
+profilers = {}
+count = [0]
+# set while a profiled call runs: nested operator calls (Freeze -> Update) 
+# are counted in the outer profile
+running = []
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    SETTINGS [ environment first, then the add-on preferences ]
+# ------------------------------------------------------------------------------
+def settings():
+    path = os.environ.get(ENV_DIR)
+    if path:
+        return path, os.environ.get(ENV_MODE, 'CALL').upper()
+    addon = bpy.context.preferences.addons.get(__package__)
+    if (addon is None) or (not addon.preferences.profile):
+        return None
+    path = bpy.path.abspath(addon.preferences.profile_dir)
+    return path or bpy.app.tempdir, addon.preferences.profile_mode
+
+def session_key(context):
+    props = getattr(context.scene, 'ptmc_props', None)
+    if props and (0 <= props.session_idx < len(props.sessions)):
+        return props.sessions[props.session_idx].target_name
+    return 'no_session'
+
+def file_name(text):
+    return ''.join(c if c.isalnum() or c in '-_.' else '_' for c in text)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    OPERATOR WRAPPER [ .prof files load in pstats/snakeviz ]
+# ------------------------------------------------------------------------------
+def profile_start(context, idname):
+    # -> (profiler, output file) or None when profiling is off
+    setts = settings()
+    if setts is None:
+        return None
+    import cProfile
+    path, mode = setts
+    os.makedirs(path, exist_ok = True)
+    if mode == 'SESSION':
+        key = session_key(context)
+        prof = profilers.setdefault(key, cProfile.Profile())
+        out = os.path.join(path, f'mcutter_{file_name(key)}.prof')
+    else:
+        prof = cProfile.Profile()
+        count[0] += 1
+        out = os.path.join(path, f'mcutter_{time.strftime("%H%M%S")}_'
+                            f'{count[0]:04d}_{file_name(idname)}.prof')
+    return prof, out
+
+def profile_call(func, idname, self, context, *args):
+    # one profile per operator run: a modal operator keeps its profiler on 
+    # the instance from execute until it returns FINISHED or CANCELLED
+    if running:
+        return func(self, context, *args)
+    run = getattr(self, 'mcutter_profile', None)
+    if (run is None) and (func.__name__ != 'modal'):
+        run = profile_start(context, idname)
+    if run is None:
+        return func(self, context, *args)
+    prof, out = run
+    result = {'CANCELLED'}
+    running.append(idname)
+    prof.enable()
+    try:
+        result = func(self, context, *args)
+        return result
+    finally:
+        prof.disable()
+        running.clear()
+        if result & {'RUNNING_MODAL', 'PASS_THROUGH'}:
+            self.mcutter_profile = run
+        else:
+            self.mcutter_profile = None
+            # session files are rewritten with the totals so far
+            prof.dump_stats(out)
+
+def profiled(func, idname):
+    # Blender checks the argument count of registered methods
+    if func.__name__ == 'modal':
+        def wrapper(self, context, event):
+            return profile_call(func, idname, self, context, event)
+    else:
+        def wrapper(self, context):
+            return profile_call(func, idname, self, context)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+def wrap(cls):
+    # execute and modal (Finalize runs its work in modal steps)
+    for name in ('execute', 'modal'):
+        func = cls.__dict__.get(name)
+        if (func is not None) and (not hasattr(func, '__wrapped__')):
+            setattr(cls, name, profiled(func, cls.bl_idname))
+
+def unwrap(cls):
+    for name in ('execute', 'modal'):
+        func = cls.__dict__.get(name)
+        if hasattr(func, '__wrapped__'):
+            setattr(cls, name, func.__wrapped__)
+    profilers.clear()
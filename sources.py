@@ -0,0 +1,138 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import bpy
+from bpy.app.handlers import persistent
+from . import profiles
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    TESSELLATION [ curve/mesh source -> unit (x, z) outline ]
+# ------------------------------------------------------------------------------
+def source_outline(context, name):
+    # cached in profiles.SOURCES until the source geometry changes
+    outline = profiles.SOURCES.get(name)
+    if outline is None:
+        ob = context.scene.objects.get(name)
+        if ob is None or ob.type not in {'MESH', 'CURVE', 'FONT'}:
+            return None
+        outline = source_tessellate(context, ob)
+        if outline is not None:
+            handlers_add()
+            profiles.SOURCES[name] = outline
+    return outline
+
+def source_tessellate(context, ob):
+    import numpy as np
+    ob_eval = ob.evaluated_get(context.evaluated_depsgraph_get())
+    me = ob_eval.to_mesh()
+    try:
+        co = np.empty(len(me.vertices) * 3, dtype = np.float64)
+        me.vertices.foreach_get('co', co)
+        edges = np.empty(len(me.edges) * 2, dtype = np.int64)
+        me.edges.foreach_get('vertices', edges)
+        edges = edges.reshape(-1, 2)
+        if me.polygons:
+            # filled outline: keep the edges of one face only (boundary)
+            users = np.zeros(len(me.edges), dtype = np.int64)
+            keys = np.empty(len(me.loops), dtype = np.int64)
+            me.loops.foreach_get('edge_index', keys)
+            np.add.at(users, keys, 1)
+            edges = edges[users == 1]
+    finally:
+        ob_eval.to_mesh_clear()
+    loop = edges_longest_loop(edges)
+    if loop is None:
+        return None
+    co = co.reshape(-1, 3)[loop]
+    # flat outline: drop the axis with the smallest extent
+    axes = np.sort(np.argsort(np.ptp(co, axis = 0))[1:])
+    return outline_normalize(co[:, axes])
+
+def edges_longest_loop(edges):
+    links = {}
+    for a, b in edges.tolist():
+        links.setdefault(a, []).append(b)
+        links.setdefault(b, []).append(a)
+    best = None
+    seen = set()
+    for start in links:
+        if start in seen or len(links[start]) != 2:
+            continue
+        loop = [start]
+        seen.add(start)
+        prev, cur = start, links[start][0]
+        while cur != start:
+            if cur in seen or len(links[cur]) != 2:
+                loop = None
+                break
+            loop.append(cur)
+            seen.add(cur)
+            prev, cur = cur, [v for v in links[cur] if v != prev][0]
+        if loop and len(loop) > 2 and (best is None or len(loop) > len(best)):
+            best = loop
+    return best
+
+def outline_normalize(outline):
+    import numpy as np
+    # centred, fitted to [-1, 1] on both axes (scaled by size x/z later)
+    lo, hi = outline.min(axis = 0), outline.max(axis = 0)
+    span = np.where(hi - lo > 1e-9, hi - lo, 1.0)
+    return (outline - (lo + hi) / 2) * (2 / span)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    HANDLERS
+# ------------------------------------------------------------------------------
+@persistent
+def sources_depsgraph_update(scene, depsgraph):
+    if not profiles.SOURCES:
+        return
+    for update in depsgraph.updates:
+        ob = update.id
+        if (isinstance(ob, bpy.types.Object) and update.is_updated_geometry 
+            and ob.name in profiles.SOURCES):
+            del profiles.SOURCES[ob.name]
+
+@persistent
+def sources_load(dummy):
+    profiles.SOURCES.clear()
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    REGISTER/UNREGISTER [ handlers are added with the first cached source ]
+# ------------------------------------------------------------------------------
+def handlers_add():
+    if sources_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(sources_depsgraph_update)
+    if sources_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(sources_load)
+
+def unregister():
+    if sources_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(sources_depsgraph_update)
+    if sources_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(sources_load)
+    profiles.SOURCES.clear()
@@ -0,0 +1,103 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import bpy
+from bpy.app.handlers import persistent
+
+# (scene name, session target name) -> status, rebuilt on first use after 
+# MCutter operators or scene/collection changes invalidate it
+cache = {}
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    SESSION STATUS [ O(1) lookups for panels and lists ]
+# ------------------------------------------------------------------------------
+def status_get(scene, props, session):
+    key = (scene.name, session.target_name)
+    status = cache.get(key)
+    if status is None:
+        status = status_build(scene, props, session)
+        cache[key] = status
+        handlers_add()
+    return status
+
+def status_build(scene, props, session):
+    target = scene.objects.get(session.target_name)
+    target_ok = (target is not None) and (target.type == 'MESH')
+    coll = scene.collection.children.get(session.coll_name)
+    present = set()
+    if coll is not None:
+        for ob in coll.objects:
+            uid = ob.get(props.base_name)
+            if uid and (ob.type == 'MESH') and (ob is not target):
+                present.add(uid)
+    return {
+        'target_ok': target_ok,
+        'valid': (target_ok and (coll is not None) and 
+                    (len(session.ul_coll) > 0)),
+        'present': present,
+        'arrays': {item.uid for item in session.ul_coll 
+                    if any(arr.count > 1 for arr in item.arr_coll)}
+        }
+
+def invalidate():
+    cache.clear()
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    HANDLERS
+# ------------------------------------------------------------------------------
+@persistent
+def status_depsgraph_update(scene, depsgraph):
+    # objects added, removed or relinked show up as collection updates
+    if cache and (depsgraph.id_type_updated('COLLECTION') or 
+                    depsgraph.id_type_updated('SCENE')):
+        cache.clear()
+
+@persistent
+def status_reset(dummy):
+    cache.clear()
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, status_depsgraph_update),
+    (bpy.app.handlers.undo_post, status_reset),
+    (bpy.app.handlers.redo_post, status_reset),
+    (bpy.app.handlers.load_post, status_reset),
+)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    REGISTER/UNREGISTER [ handlers are added on first use ]
+# ------------------------------------------------------------------------------
+def handlers_add():
+    for handler_list, func in handlers:
+        if func not in handler_list:
+            handler_list.append(func)
+
+def unregister():
+    for handler_list, func in handlers:
+        if func in handler_list:
+            handler_list.remove(func)
+    cache.clear()
@@ -0,0 +1,107 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+"""Microbenchmarks for the MCutter geometry kernels (plain CPython).
+
+    python -m pytest tests/bench_geometry.py
+
+With pytest-benchmark installed the usual --benchmark-* options apply
+(e.g. --benchmark-autosave / --benchmark-compare in CI). Each benchmark
+also checks the shape of its result, so a kernel that got faster by
+getting wrong fails here too.
+"""
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import math
+
+import numpy as np
+import pytest
+
+PROFILES = ('Rectangle', 'Ellipse', 'Wave', 'Star', 'Noise')
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    KERNELS
+# ------------------------------------------------------------------------------
+def test_rotation(benchmark, geometry):
+    a = np.linspace(0.0, 2 * math.pi, 64)
+    rot = benchmark(geometry.rotation, (0, 0, 1), a)
+    assert rot.shape == (64, 3, 3)
+    assert np.allclose(rot @ rot.transpose(0, 2, 1), np.eye(3))
+
+def test_grid_faces(benchmark, geometry):
+    faces = benchmark(geometry.grid_faces, 256, 32, True, True)
+    assert faces.shape == (256 * 32, 4)
+
+def test_prism(benchmark, geometry, params):
+    points, dirs = geometry.ellipse_outline(params)
+    co, blocks = benchmark(geometry.prism, points, 0.05)
+    assert co.shape == (2 * len(points), 3)
+    assert sum(len(b) for b in blocks) == len(points) + 2
+
+def test_sweep(benchmark, geometry, params):
+    points, dirs = geometry.ellipse_outline(params)
+    ring = geometry.ring_round(0.05, 0.05, 16)
+    co, blocks = benchmark(geometry.sweep, points + 0.05 * dirs, -dirs, ring, 
+                            True)
+    assert co.shape == (16 * len(points), 3)
+
+def test_noise_grid(benchmark, geometry):
+    # the uncached kernel, the add-on keeps results in an lru_cache
+    grid = benchmark(geometry.noise_grid.__wrapped__, 0, 128, 16, 4.0, 4)
+    assert grid.shape == (128, 16)
+    assert np.abs(grid).max() <= 1.0
+
+def test_radial_transforms(benchmark, geometry):
+    rot, loc = benchmark(geometry.radial_transforms, 'Y', math.pi / 8, 16, 
+                        0.5, 0.1, True)
+    assert rot.shape == (16, 3, 3)
+    assert loc.shape == (16, 3)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    CUTTER MESH
+# ------------------------------------------------------------------------------
+@pytest.mark.parametrize('frame', (False, True), ids = ('solid', 'frame'))
+@pytest.mark.parametrize('profile', PROFILES)
+def test_cutter_arrays(benchmark, geometry, profiles, params, profile, frame):
+    params.cutter_profile = profile
+    params.frame = frame
+    params.frame_curve = True
+    params.radial = True
+    prof = profiles.PROFILES[profile]
+    co, loops, totals = benchmark(geometry.cutter_arrays, params, prof)
+    assert totals.sum() == len(loops)
+    assert loops.max() < len(co)
+
+def test_preview_lines(benchmark, geometry, profiles, params):
+    params.frame = True
+    params.frame_curve = True
+    params.radial = True
+    co, loops, totals = geometry.cutter_arrays(params, 
+                                                profiles.PROFILES['Ellipse'])
+    world, edges = benchmark(geometry.preview_lines, co, loops, totals, 
+                            np.eye(4))
+    assert world.dtype == np.float32
+    # closed quad mesh: edges = 2 x faces
+    assert len(edges) == 2 * len(totals)
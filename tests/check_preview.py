@@ -0,0 +1,74 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+"""Preview overlay batch data (geometry.preview_lines), without Blender."""
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import math
+
+import numpy as np
+import pytest
+
+PROFILES = ('Rectangle', 'Ellipse', 'Wave', 'Star', 'Noise')
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    TESTS
+# ------------------------------------------------------------------------------
+def placement(angle, loc):
+    # rotation about z, then translation (cutter matrix without scale)
+    m = np.eye(4)
+    c, s = math.cos(angle), math.sin(angle)
+    m[:2, :2] = ((c, -s), (s, c))
+    m[:3, 3] = loc
+    return m
+
+@pytest.mark.parametrize('frame', (False, True), ids = ('solid', 'frame'))
+@pytest.mark.parametrize('profile', PROFILES)
+def test_preview_lines(geometry, profiles, params, profile, frame):
+    params.cutter_profile = profile
+    params.frame = frame
+    params.radial = True
+    co, loops, totals = geometry.cutter_arrays(params, 
+                                                profiles.PROFILES[profile])
+    matrix = placement(0.7, (1.0, -2.0, 0.5))
+    world, edges = geometry.preview_lines(co, loops, totals, matrix)
+    assert world.dtype == np.float32
+    assert world.shape == co.shape
+    assert np.allclose(world, co @ matrix[:3, :3].T + matrix[:3, 3], 
+                        atol = 1e-5)
+    assert edges.dtype == np.int32
+    assert edges.shape[1] == 2
+    assert (edges[:, 0] < edges[:, 1]).all()
+    assert len(np.unique(edges, axis = 0)) == len(edges)
+    assert edges.max() < len(world)
+    # closed shells: every face edge is shared by two faces
+    assert 2 * len(edges) == len(loops)
+
+def test_preview_lines_identity(geometry, profiles, params):
+    co, loops, totals = geometry.cutter_arrays(params, 
+                                                profiles.PROFILES['Ellipse'])
+    world, edges = geometry.preview_lines(co, loops, totals, np.eye(4))
+    assert np.allclose(world, co, atol = 1e-6)
+    # prism: ring quads plus the two cap outlines
+    assert len(edges) == 3 * params.cutter_res
@@ -0,0 +1,98 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+"""pytest fixtures for the bpy-free MCutter modules.
+
+The add-on package imports bpy, so geometry.py and profiles.py are loaded
+by path. Without pytest-benchmark installed, `benchmark` falls back to a
+plain timer that runs each kernel a few times and prints the best time.
+"""
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import importlib.util
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    MODULES
+# ------------------------------------------------------------------------------
+def module_load(name):
+    spec = importlib.util.spec_from_file_location(
+                            f'mcutter_{name}', os.path.join(PKG_DIR, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope = 'session')
+def geometry():
+    return module_load('geometry')
+
+@pytest.fixture(scope = 'session')
+def profiles():
+    return module_load('profiles')
+
+@pytest.fixture
+def params():
+    # Update operator defaults, as attributes
+    return SimpleNamespace(
+        cutter_profile = 'Ellipse', cutter_size = (2.5, 0.1, 2.5),
+        cutter_res = 32, frame = False, frame_curve = False, 
+        frame_size = 0.2, frame_res = 8,
+        radial = False, radial_axis = 'Y', radial_angle = 1.570796326794, 
+        radial_steps = 4, radial_radius = 0.5, radial_offset = 0.0, 
+        radial_offset_symm = False,
+        wave_freq = 0.5, wave_amp = 0.2, wave_phase = 0.0, wave_flip = False,
+        star_ratio = 0.5,
+        noise_seed = 0, noise_scale = 4.0, noise_octaves = 3, noise_amp = 0.2)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    BENCHMARK FALLBACK [ pytest-benchmark not installed ]
+# ------------------------------------------------------------------------------
+try:
+    import pytest_benchmark
+except ImportError:
+    class Timer:
+        rounds = 5
+
+        def __init__(self, name):
+            self.name = name
+
+        def __call__(self, func, *args, **kwargs):
+            best = float('inf')
+            for i in range(self.rounds):
+                t = time.perf_counter()
+                result = func(*args, **kwargs)
+                best = min(best, time.perf_counter() - t)
+            print(f'\n  {self.name}: {best * 1e6:.1f}us (best of {self.rounds})')
+            return result
+
+    @pytest.fixture
+    def benchmark(request):
+        return Timer(request.node.name)
@@ -0,0 +1,374 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+"""MCutter cutter geometry regression test (golden hashes).
+
+Headless Blender, through the Update operator:
+
+    blender --background --factory-startup --python tests/golden.py
+
+Regenerate the golden values from geometry.py (plain Python + numpy,
+only after an intended geometry change):
+
+    pip install mathutils
+    python tests/golden.py --update (--baseline REF | --no-baseline)
+
+Before writing, --update cross-checks geometry.py against the bmesh
+mesh_update_* builders it replaced (read from git at REF, run with
+mathutils and a recording BMesh). REF is the parent of the commit that
+removed them, found in any clone with BASELINE_FIND + '^'; tag it once
+(git tag mcutter-bmesh-baseline REF) and pass the tag name. Vertex order may differ, so
+vertices are matched by position and faces, winding included, must be
+the same. Star and Noise came after the rewrite and have no baseline.
+
+Every profile x frame x frame_curve x radial x wave_flip case is hashed
+(vertex coords rounded to 1e-4, loops, loop totals) and compared with
+tests/golden.json. Each case is also checked for closed, consistently
+wound shells with the expected Euler characteristic.
+"""
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import importlib
+import importlib.util
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+from hashlib import blake2b
+from types import SimpleNamespace
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PKG_DIR = os.path.dirname(TESTS_DIR)
+GOLDEN = os.path.join(TESTS_DIR, 'golden.json')
+# lists the commit that removed the bmesh cutter builders first: the 
+# baseline is its parent (no fixed SHA, history can be rewritten)
+BASELINE_FIND = "git log -S'def cutter_mesh_update_' --format=%h -- ops.py"
+BASELINE_PROFILES = ('Rectangle', 'Ellipse', 'Wave')
+# the Custom profile needs a scene source object, it is not covered here
+PROFILES = ('Rectangle', 'Ellipse', 'Wave', 'Star', 'Noise')
+BASE = {
+    'cutter_size': (2.5, 0.1, 2.5), 'cutter_res': 12, 'cutter_validate': 'OFF',
+    'frame_size': 0.2, 'frame_res': 8,
+    'radial_axis': 'Y', 'radial_angle': 1.570796326794, 'radial_steps': 3,
+    'radial_radius': 0.5, 'radial_offset': 0.1, 'radial_offset_symm': True,
+    'radial_merge': False,
+    'wave_freq': 0.5, 'wave_amp': 0.2, 'wave_phase': 0.3,
+    'star_ratio': 0.5,
+    'noise_seed': 7, 'noise_scale': 4.0, 'noise_octaves': 3, 'noise_amp': 0.2,
+    }
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    CASES
+# ------------------------------------------------------------------------------
+def cases():
+    for profile, frame, curve, radial, flip in itertools.product(
+            PROFILES, (False, True), (False, True), (False, True),
+            (False, True)):
+        name = (f'{profile}-frame{int(frame)}-curve{int(curve)}'
+                f'-radial{int(radial)}-flip{int(flip)}')
+        yield name, dict(BASE, cutter_profile = profile, frame = frame,
+                        frame_curve = curve, radial = radial, wave_flip = flip)
+
+def case_shells(params):
+    # radial copies x (tube + mirrored tube for the Wave frame)
+    steps = params['radial_steps'] if params['radial'] else 1
+    per_copy = 2 if (params['frame'] and
+                    params['cutter_profile'] == 'Wave') else 1
+    return steps * per_copy
+
+def case_euler(params):
+    # per shell: prism/capped tube = sphere (2), closed frame = torus (0)
+    if params['frame'] and params['cutter_profile'] != 'Wave':
+        return 0
+    return 2
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    CHECKS
+# ------------------------------------------------------------------------------
+def arrays_hash(co, loops, totals):
+    co = np.round(np.asarray(co, dtype = np.float32).astype(np.float64), 4)
+    h = blake2b(digest_size = 16)
+    h.update((co + 0.0).tobytes())
+    h.update(np.asarray(loops, dtype = np.int32).tobytes())
+    h.update(np.asarray(totals, dtype = np.int32).tobytes())
+    return h.hexdigest()
+
+def topology_errors(co, loops, totals, shells, euler):
+    errors = []
+    starts = np.zeros(len(totals), dtype = np.int64)
+    np.cumsum(totals[:-1], out = starts[1:])
+    face = np.repeat(np.arange(len(totals)), totals)
+    first = starts[face]
+    nxt = loops[first + (np.arange(len(loops)) - first + 1) % totals[face]]
+    directed = np.stack((loops, nxt), axis = -1)
+    if len(np.unique(directed, axis = 0)) != len(directed):
+        errors.append('inconsistent winding (repeated directed edge)')
+    edges, counts = np.unique(np.sort(directed, axis = 1), axis = 0,
+                                return_counts = True)
+    if (counts != 2).any():
+        errors.append(f'{int((counts != 2).sum())} non-manifold edges')
+    chi = len(co) - len(edges) + len(totals)
+    if chi != shells * euler:
+        errors.append(f'euler {chi}, expected {shells * euler} '
+                        f'({shells} shells)')
+    return errors
+
+def case_check(name, params, co, loops, totals, golden):
+    errors = topology_errors(co, loops, totals, case_shells(params),
+                            case_euler(params))
+    expected = golden.get(name)
+    if expected is None:
+        errors.append('no golden value')
+    else:
+        if [len(co), len(totals)] != expected['counts']:
+            errors.append(f"counts {[len(co), len(totals)]}, "
+                            f"expected {expected['counts']}")
+        if arrays_hash(co, loops, totals) != expected['hash']:
+            errors.append('hash mismatch')
+    return errors
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    GOLDEN VALUES [ plain Python: geometry.py without Blender ]
+# ------------------------------------------------------------------------------
+def module_load(name):
+    spec = importlib.util.spec_from_file_location(
+                            f'mcutter_{name}', os.path.join(PKG_DIR, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def golden_arrays(params):
+    geometry = module_load('geometry')
+    profiles = module_load('profiles')
+    prof = profiles.PROFILES[params['cutter_profile']]
+    return geometry.cutter_arrays(SimpleNamespace(**params), prof)
+
+def golden_update(baseline):
+    try:
+        builders = baseline_builders(baseline) if baseline else None
+    except (OSError, subprocess.CalledProcessError, ValueError) as err:
+        print(f'golden: no baseline builders at {baseline!r}: ' + 
+                (getattr(err, 'stderr', None) or str(err)).strip())
+        print(f'golden: the baseline is the parent (^) of the first '
+                f'commit listed by: {BASELINE_FIND}')
+        return 2
+    golden = {}
+    failed = 0
+    for name, params in cases():
+        co, loops, totals = golden_arrays(params)
+        errors = topology_errors(co, loops, totals, case_shells(params),
+                                case_euler(params))
+        checked = bool(builders and 
+                        params['cutter_profile'] in BASELINE_PROFILES)
+        if checked and not same_geometry((co, loops, totals), 
+                                        baseline_arrays(builders, params)):
+            errors.append(f'differs from the {baseline} builders')
+        if errors:
+            failed += 1
+            print(f'  {name}: ' + '; '.join(errors))
+        golden[name] = {'counts': [len(co), len(totals)],
+                        'hash': arrays_hash(co, loops, totals),
+                        'baseline': checked}
+    if failed:
+        print(f'golden: {failed} cases failed, {GOLDEN} not written')
+        return 1
+    with open(GOLDEN, 'w') as f:
+        json.dump(golden, f, indent = 1, sort_keys = True)
+    print(f'golden: {len(golden)} cases written to {GOLDEN} '
+            f"({sum(g['baseline'] for g in golden.values())} "
+            f'matched against {baseline or "no baseline"})')
+    return 0
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    BASELINE [ pre-geometry.py bmesh builders, plain Python + mathutils ]
+# ------------------------------------------------------------------------------
+class RecordBMesh:
+    # the part of the BMesh API the old builders use, recorded as arrays
+    def __init__(self, use_operators = True):
+        self.co = []
+        self.polys = []
+        self.verts = SimpleNamespace(new = self.vert_new)
+        self.faces = SimpleNamespace(new = self.face_new)
+
+    def vert_new(self, co):
+        self.co.append(tuple(co))
+        return len(self.co) - 1
+
+    def face_new(self, verts):
+        self.polys.append(list(verts))
+
+    def to_mesh(self, me):
+        me.bm = self
+
+    def free(self):
+        pass
+
+def baseline_builders(ref):
+    # the Update operator methods at ref, as a plain class
+    import ast
+    from mathutils import Matrix, Quaternion, Vector
+    src = subprocess.run(['git', 'show', f'{ref}:ops.py'], cwd = PKG_DIR, 
+                        capture_output = True, text = True, 
+                        check = True).stdout
+    cls = next((node for node in ast.parse(src).body 
+                if isinstance(node, ast.ClassDef) and 
+                    node.name == 'MCUTTER_OT_update'), None)
+    funcs = [node for node in (cls.body if cls else ()) 
+                if isinstance(node, ast.FunctionDef) and 
+                    node.name not in ('invoke', 'execute', 'draw')]
+    if not any(f.name.startswith('cutter_mesh_update_') for f in funcs):
+        raise ValueError('ops.py has no cutter_mesh_update_* builders')
+    scope = {'math': math, 'Matrix': Matrix, 'Quaternion': Quaternion, 
+            'Vector': Vector, 'bmesh': SimpleNamespace(new = RecordBMesh)}
+    exec(compile(ast.Module(body = funcs, type_ignores = []), 
+                f'{ref}:ops.py', 'exec'), scope)
+    return type('Builders', (), {f.name: scope[f.name] for f in funcs})
+
+def baseline_arrays(builders, params):
+    op = builders()
+    op.__dict__.update(params)
+    me = SimpleNamespace(update = lambda: None)
+    getattr(op, f"cutter_mesh_update_{params['cutter_profile'].lower()}")(me)
+    return (np.array(me.bm.co), 
+            np.array([i for f in me.bm.polys for i in f], dtype = np.int32), 
+            np.array([len(f) for f in me.bm.polys], dtype = np.int32))
+
+def faces_set(loops, totals):
+    # faces as vertex cycles starting at the lowest index (winding kept)
+    faces = set()
+    start = 0
+    for n in totals:
+        f = loops[start:start + n].tolist()
+        start += n
+        i = f.index(min(f))
+        faces.add(tuple(f[i:] + f[:i]))
+    return faces
+
+def same_geometry(a, b, dist = 1e-5):
+    co_a, loops_a, totals_a = a
+    co_b, loops_b, totals_b = b
+    if (len(co_a) != len(co_b)) or (len(totals_a) != len(totals_b)):
+        return False
+    d = np.linalg.norm(co_a[:, None, :] - co_b[None, :, :], axis = -1)
+    match = d.argmin(axis = 1)
+    if ((d[np.arange(len(co_a)), match] > dist).any() or 
+            (len(np.unique(match)) != len(match))):
+        return False
+    return faces_set(match[loops_a], totals_a) == faces_set(loops_b, totals_b)
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    BLENDER RUN
+# ------------------------------------------------------------------------------
+def mesh_arrays(me):
+    co = np.empty(len(me.vertices) * 3, dtype = np.float32)
+    me.vertices.foreach_get('co', co)
+    loops = np.empty(len(me.loops), dtype = np.int32)
+    me.loops.foreach_get('vertex_index', loops)
+    totals = np.empty(len(me.polygons), dtype = np.int32)
+    me.polygons.foreach_get('loop_total', totals)
+    return co.reshape(-1, 3), loops, totals
+
+def blender_run():
+    import bpy
+    sys.path.insert(0, os.path.dirname(PKG_DIR))
+    addon = importlib.import_module(os.path.basename(PKG_DIR))
+    addon.register()
+    with open(GOLDEN) as f:
+        golden = json.load(f)
+    bpy.ops.wm.read_factory_settings(use_empty = True)
+    bpy.ops.mesh.primitive_cube_add(size = 4)
+    if bpy.ops.mcutter.target_set() != {'FINISHED'}:
+        print('golden: target_set failed')
+        return 1
+    scene = bpy.context.scene
+    props = scene.ptmc_props
+    session = props.sessions[props.session_idx]
+    target = scene.objects.get(session.target_name)
+    coll = scene.collection.children.get(session.coll_name)
+    item = session.ul_coll[session.ul_idx]
+    failed = 0
+    total = 0
+    for name, params in cases():
+        total += 1
+        args = addon.ops.update_params(session, item)
+        args.update(params)
+        if bpy.ops.mcutter.update('EXEC_DEFAULT', **args) != {'FINISHED'}:
+            errors = ['update failed']
+        else:
+            cutter = addon.ops.cutter_find(props.base_name, item.uid, target,
+                                            coll)
+            errors = case_check(name, params, *mesh_arrays(cutter.data),
+                                golden)
+        if errors:
+            failed += 1
+            print(f'  FAIL {name}: ' + '; '.join(errors))
+    verified = sum(bool(g.get('baseline')) for g in golden.values())
+    print(f'golden: {total - failed}/{total} cases passed '
+            f'({verified} goldens verified against the bmesh builders)')
+    addon.unregister()
+    return 1 if failed else 0
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    MAIN
+# ------------------------------------------------------------------------------
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else \
+            sys.argv[1:]
+    if '--update' in argv:
+        baseline = None
+        if '--no-baseline' not in argv:
+            i = argv.index('--baseline') + 1 if '--baseline' in argv else 0
+            if not 0 < i < len(argv):
+                print('golden: --update needs --baseline REF or '
+                        '--no-baseline; REF is the parent (^) of the first '
+                        f'commit listed by: {BASELINE_FIND}')
+                return 2
+            baseline = argv[i]
+            try:
+                import mathutils
+            except ImportError:
+                print('golden: the baseline check needs mathutils '
+                        '(pip install mathutils) or --no-baseline')
+                return 2
+        return golden_update(baseline)
+    try:
+        import bpy
+    except ImportError:
+        print('golden: run inside Blender (or use --update)')
+        return 2
+    return blender_run()
+
+if __name__ == '__main__':
+    code = main()
+    if code:
+        sys.exit(code)
@@ -0,0 +1,154 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+
+"""MCutter memory soak test (headless Blender).
+
+    blender --background --factory-startup --python tests/soak.py -- \
+        --cycles 5000 --sample 250 --rss-limit 64
+
+Adds, builds (every 10th cutter is also frozen) and removes cutters in a
+loop, sampling the MCutter mesh report, the datablock counts and the
+process RSS. Fails if MCutter meshes or orphans accumulate, or if RSS
+grows by more than --rss-limit MB after the first sample.
+"""
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import bpy
+
+PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ('Rectangle', 'Ellipse', 'Star', 'Noise')
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    SAMPLES
+# ------------------------------------------------------------------------------
+def rss_mb():
+    # current resident size on Linux, peak size elsewhere
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1048576
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1048576 if sys.platform == 'darwin' else 1024)
+
+def sample_take(addon, name, cycle):
+    report = addon.memory.memory_report(name)
+    return dict(report, cycle = cycle, rss = rss_mb(), 
+                all_meshes = len(bpy.data.meshes), 
+                objects = len(bpy.data.objects))
+
+def sample_print(s):
+    print(f"  {s['cycle']:>6}  meshes {s['meshes']:>4} "
+            f"(orphans {s['orphans']}, all {s['all_meshes']})  "
+            f"objects {s['objects']:>4}  verts {s['verts']:>6}  "
+            f"rss {s['rss']:.1f} MB")
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    SOAK
+# ------------------------------------------------------------------------------
+def cycle_run(addon, props, i):
+    if bpy.ops.mcutter.add_item() != {'FINISHED'}:
+        raise RuntimeError(f'add_item failed at cycle {i}')
+    session = props.sessions[props.session_idx]
+    params = addon.ops.update_params(session, session.ul_coll[session.ul_idx])
+    params.update(cutter_profile = PROFILES[i % len(PROFILES)], 
+                    cutter_res = 8 + i % 8, frame = bool(i % 3), 
+                    radial = bool(i % 2), radial_merge = False, 
+                    cutter_validate = 'OFF')
+    if bpy.ops.mcutter.update('EXEC_DEFAULT', **params) != {'FINISHED'}:
+        raise RuntimeError(f'update failed at cycle {i}')
+    if i % 10 == 0:
+        bpy.ops.mcutter.freeze_item()
+    if bpy.ops.mcutter.remove_item() != {'FINISHED'}:
+        raise RuntimeError(f'remove_item failed at cycle {i}')
+
+def soak(args):
+    sys.path.insert(0, os.path.dirname(PKG_DIR))
+    addon = importlib.import_module(os.path.basename(PKG_DIR))
+    addon.register()
+    bpy.ops.wm.read_factory_settings(use_empty = True)
+    bpy.ops.mesh.primitive_cube_add(size = 4)
+    if bpy.ops.mcutter.target_set() != {'FINISHED'}:
+        print('soak: target_set failed')
+        return 1
+    props = bpy.context.scene.ptmc_props
+    name = props.base_name
+    samples = []
+    t = time.perf_counter()
+    for i in range(args.cycles):
+        cycle_run(addon, props, i)
+        if (i + 1) % args.sample == 0:
+            samples.append(sample_take(addon, name, i + 1))
+            sample_print(samples[-1])
+    wall = time.perf_counter() - t
+    purged = addon.memory.orphans_purge(name)
+    last = sample_take(addon, name, args.cycles)
+    print(f'soak: {args.cycles} cycles in {wall:.1f}s, '
+            f'{purged} orphans purged at the end')
+    print('  ' + addon.memory.report_message(last))
+    errors = []
+    if samples:
+        first = samples[0]
+        if max(s['meshes'] for s in samples) > first['meshes']:
+            errors.append('MCutter mesh count grew')
+        if any(s['orphans'] for s in samples):
+            errors.append('orphan MCutter meshes left behind')
+        if last['all_meshes'] > first['all_meshes']:
+            errors.append('mesh datablock count grew')
+        growth = last['rss'] - first['rss']
+        print(f'  rss growth {growth:.1f} MB (limit {args.rss_limit} MB)')
+        if growth > args.rss_limit:
+            errors.append(f'rss grew by {growth:.1f} MB')
+    for e in errors:
+        print(f'  FAIL {e}')
+    addon.unregister()
+    return 1 if errors else 0
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    MAIN
+# ------------------------------------------------------------------------------
+def main():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description = 'MCutter soak test')
+    parser.add_argument('--cycles', type = int, default = 2000, 
+                        help = 'cutters added and removed')
+    parser.add_argument('--sample', type = int, default = 100, 
+                        help = 'cycles between samples')
+    parser.add_argument('--rss-limit', type = float, default = 64.0, 
+                        help = 'allowed RSS growth (MB)')
+    return soak(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    code = main()
+    if code:
+        sys.exit(code)
@@ -23,6 +23,33 @@
 #    IMPORTS
 # ------------------------------------------------------------------------------
 import bpy
+from . import profiles, status
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    SESSION FUNCTIONS
+# ------------------------------------------------------------------------------
+def session_get(props):
+    if 0 <= props.session_idx < len(props.sessions):
+        return props.sessions[props.session_idx]
+    return None
+
+def session_effects_set(scene, session, active):
+    target = scene.objects.get(session.target_name)
+    if target is None:
+        return
+    show = active and session.target_bool_effects
+    # booleans not owned by the session (shared cutters) are always on
+    effects = {item.p_name: item.cutter_effect for item in session.ul_coll}
+    for mod in target.modifiers:
+        if mod.type == 'BOOLEAN':
+            mod.show_viewport = show and effects.get(mod.name, True)
+
+def session_switch(self, context):
+    # only the active session's booleans are evaluated in the viewport
+    scene = context.scene
+    for i, session in enumerate(self.sessions):
+        session_effects_set(scene, session, i == self.session_idx)
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
@@ -40,18 +67,31 @@ class CUT_array(bpy.types.PropertyGroup):
         default = [0.0, 0.3, 0.0], size = 3
         )
 
+class CUT_link(bpy.types.PropertyGroup):
+    """Cutter shared with another session target"""
+    name: bpy.props.StringProperty(default = '')
+
 class UIL_item(bpy.types.PropertyGroup):
     """UIL collection item (cutter) properties"""
     name: bpy.props.StringProperty(default = 'name')
     p_name: bpy.props.StringProperty(default = 'p_name')
     uid: bpy.props.IntProperty(default = 0)
     arr_coll: bpy.props.CollectionProperty(type = CUT_array)
+    links: bpy.props.CollectionProperty(type = CUT_link)
+    frozen: bpy.props.BoolProperty(
+        name = 'Frozen', description = 'Cutter modifiers baked into its mesh', 
+        default = False
+        )
+    previewed: bpy.props.BoolProperty(
+        name = 'Previewed', description = 'Cutter settings not built yet', 
+        default = False
+        )
+    stage_hashes: bpy.props.StringProperty(
+        name = 'Stage Hashes', description = 'Settings digest per Update stage', 
+        default = ''
+        )
     cutter_profile: bpy.props.EnumProperty(
-        items = (
-        ('Rectangle', 'Rectangle', 'rectangle profile'),
-        ('Ellipse', 'Ellipse', 'ellipse profile'),
-        ('Wave', 'Wave', 'wave profile'),
-        ),
+        items = profiles.profile_items(),
         name = 'Profile',
         description = 'Select profile',
         default = 'Ellipse'
@@ -66,6 +106,21 @@ class UIL_item(bpy.types.PropertyGroup):
         description = 'Select boolean operation',
         default = 'DIFFERENCE',
         )
+    cutter_solver: bpy.props.EnumProperty(
+        items = (
+        ('DEFAULT', 'Default', 'use the session solver'),
+        ('FAST', 'Fast', 'fast boolean solver'),
+        ('EXACT', 'Exact', 'exact boolean solver'),
+        ('AUTO', 'Auto', 'fast while editing, exact on finalize'),
+        ),
+        name = 'Solver',
+        description = 'Select boolean solver',
+        default = 'DEFAULT',
+        )
+    cutter_effect: bpy.props.BoolProperty(
+        name = 'Effect', description = 'Show effect', 
+        default = True
+        )
     cutter_size: bpy.props.FloatVectorProperty(
         name = 'Size', description = 'Cutter dimensions', 
         default = [2.5, 0.1, 2.5], min = 0.0001, size = 3
@@ -74,6 +129,16 @@ class UIL_item(bpy.types.PropertyGroup):
         name = 'Profile Segs', description = 'Profile segments', 
         default = 4, min = 3, soft_max = 90
         )
+    cutter_validate: bpy.props.EnumProperty(
+        items = (
+        ('OFF', 'No Check', 'do not check the cutter geometry'),
+        ('WARN', 'Warn', 'report degenerate cutter geometry'),
+        ('FIX', 'Fix', 'merge degenerate cutter geometry'),
+        ),
+        name = 'Check',
+        description = 'Degenerate geometry check',
+        default = 'WARN',
+        )
     frame: bpy.props.BoolProperty(
         name = 'Frame', description = 'Use frame cutter', 
         default = False
@@ -124,6 +189,11 @@ class UIL_item(bpy.types.PropertyGroup):
         name = 'Offset Mirror', description = 'Radial offset symmetry', 
         default = False
         )
+    radial_merge: bpy.props.BoolProperty(
+        name = 'Merge', 
+        description = 'Union the radial copies into a single volume', 
+        default = False
+        )
     wave_freq: bpy.props.FloatProperty(
         name = 'Frequency', description = 'Wave frequency', 
         default = 0.5
@@ -140,6 +210,30 @@ class UIL_item(bpy.types.PropertyGroup):
         name = 'Flip', description = 'Wave flip profile axes', 
         default = False
         )
+    star_ratio: bpy.props.FloatProperty(
+        name = 'Inner Ratio', description = 'Star inner radius ratio', 
+        default = 0.5, min = 0.01, max = 1.0
+        )
+    custom_source: bpy.props.StringProperty(
+        name = 'Source', description = 'Curve or flat mesh outline object', 
+        default = ''
+        )
+    noise_seed: bpy.props.IntProperty(
+        name = 'Seed', description = 'Noise seed', 
+        default = 0, min = 0
+        )
+    noise_scale: bpy.props.FloatProperty(
+        name = 'Scale', description = 'Noise features around the profile', 
+        default = 4.0, min = 1.0, soft_max = 32.0
+        )
+    noise_octaves: bpy.props.IntProperty(
+        name = 'Octaves', description = 'Noise detail levels', 
+        default = 2, min = 1, max = 8
+        )
+    noise_amp: bpy.props.FloatProperty(
+        name = 'Amplitude', description = 'Noise displacement (size ratio)', 
+        default = 0.2, min = 0.0, soft_max = 1.0
+        )
     cutter_rot: bpy.props.FloatVectorProperty(
         name = 'Rotation', description = 'Rotate the cutter', 
         default = [0.0, 0.0, 0.0], size = 3, subtype = 'EULER'
@@ -173,30 +267,17 @@ class UIL_item(bpy.types.PropertyGroup):
         default = 0.5, min = 0.0, max = 1.0
         )
 
-class MCUTTER_properties(bpy.types.PropertyGroup):
-    """MCutter add-on properties"""
-    base_name: bpy.props.StringProperty(default = 'MCutter')
-    temps_clear: bpy.props.BoolProperty(
-        name = 'Remove Temps', description = 'Remove all temporary objects', 
-        default = True
-        )
+class MCUTTER_session(bpy.types.PropertyGroup):
+    """MCutter session (target) properties"""
+    name: bpy.props.StringProperty(default = 'Session')
+    target_name: bpy.props.StringProperty(default = '')
+    coll_name: bpy.props.StringProperty(default = '')
     ul_coll: bpy.props.CollectionProperty(type = UIL_item)
     ul_idx: bpy.props.IntProperty(name = 'MCutter item', default = 0)
-    ob_id: bpy.props.IntProperty(default = 0)
-    coll_name: bpy.props.StringProperty(default = '')
-    copy_setts: bpy.props.BoolProperty(
-        name = 'Copy settings', description = 'Copy settings to new cutter', 
-        default = True
-        )
-    target_name: bpy.props.StringProperty(default = '')
-    target_apply_scale: bpy.props.BoolProperty(
-        name = 'Apply Scale', description = 'Apply Scale', 
-        default = True
-        )
-    target_old_mods_remove: bpy.props.BoolProperty(
-        name = 'Remove Modifiers', 
-        description = 'Remove existing modifiers. Original is not affected', 
-        default = True
+    prep_info: bpy.props.StringProperty(default = '')
+    stage_hash: bpy.props.StringProperty(
+        name = 'Stage Hash', description = 'Session settings digest', 
+        default = ''
         )
     target_bool_effects: bpy.props.BoolProperty(
         name = 'Effects', description = 'Show boolean effects', 
@@ -222,6 +303,99 @@ class MCUTTER_properties(bpy.types.PropertyGroup):
         name = 'Profile', description = 'Bevel profile', 
         default = 0.5, min = 0.0, max = 1.0
         )
+    target_solver: bpy.props.EnumProperty(
+        items = (
+        ('FAST', 'Fast', 'fast boolean solver'),
+        ('EXACT', 'Exact', 'exact boolean solver'),
+        ('AUTO', 'Auto', 'fast while editing, exact on finalize'),
+        ),
+        name = 'Session Solver',
+        description = 'Default boolean solver of the session cutters',
+        default = 'AUTO',
+        )
+    target_symmetry: bpy.props.BoolVectorProperty(
+        name = 'Symmetry', 
+        description = 'Mirror the cut Target in its local axes', 
+        default = (False, False, False), size = 3, subtype = 'XYZ'
+        )
+
+class MCUTTER_properties(bpy.types.PropertyGroup):
+    """MCutter add-on properties"""
+    base_name: bpy.props.StringProperty(default = 'MCutter')
+    temps_clear: bpy.props.BoolProperty(
+        name = 'Remove Temps', description = 'Remove all temporary objects', 
+        default = True
+        )
+    sessions: bpy.props.CollectionProperty(type = MCUTTER_session)
+    session_idx: bpy.props.IntProperty(
+        name = 'MCutter session', default = 0, update = session_switch
+        )
+    ob_id: bpy.props.IntProperty(default = 0)
+    copy_setts: bpy.props.BoolProperty(
+        name = 'Copy settings', description = 'Copy settings to new cutter', 
+        default = True
+        )
+    preview: bpy.props.BoolProperty(
+        name = 'Preview', 
+        description = 'Update draws the cutter only, Commit builds it', 
+        default = False
+        )
+    target_apply_scale: bpy.props.BoolProperty(
+        name = 'Apply Scale', description = 'Apply Scale', 
+        default = True
+        )
+    target_old_mods_remove: bpy.props.BoolProperty(
+        name = 'Remove Modifiers', 
+        description = 'Remove existing modifiers. Original is not affected', 
+        default = True
+        )
+    target_prep: bpy.props.BoolProperty(
+        name = 'Clean Mesh', 
+        description = ('Merge by distance, triangulate n-gons, recalculate '
+                        'normals and remove loose geometry. Original is not '
+                        'affected'), 
+        default = False
+        )
+    target_prep_dist: bpy.props.FloatProperty(
+        name = 'Merge', description = 'Merge distance', 
+        default = 0.0001, min = 0.0, soft_max = 0.01, precision = 5
+        )
+
+class MCUTTER_preferences(bpy.types.AddonPreferences):
+    """MCutter add-on preferences"""
+    bl_idname = __package__
+
+    profile: bpy.props.BoolProperty(
+        name = 'Profile Operators', 
+        description = ('Run MCutter operators under cProfile and save .prof '
+                        'files (pstats, snakeviz)'), 
+        default = False
+        )
+    profile_dir: bpy.props.StringProperty(
+        name = 'Directory', 
+        description = 'Folder for the .prof files [empty: temporary folder]', 
+        default = '', subtype = 'DIR_PATH'
+        )
+    profile_mode: bpy.props.EnumProperty(
+        items = (
+        ('CALL', 'Per Call', 'one file per operator call'),
+        ('SESSION', 'Per Session', 'one file per session, all calls added'),
+        ),
+        name = 'Files',
+        description = 'How profiles are grouped into files',
+        default = 'CALL',
+        )
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row()
+        row.prop(self, 'profile')
+        sub = row.row()
+        sub.enabled = self.profile
+        sub.prop(self, 'profile_mode', text = '')
+        row = layout.row()
+        row.enabled = self.profile
+        row.prop(self, 'profile_dir')
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
@@ -233,19 +407,26 @@ class MCUTTER_UL_lst(bpy.types.UIList):
                     active_propname, index):
         self.use_filter_show = False
         scene = context.scene
-        props = scene.ptmc_props
-        t = scene.objects.get(props.target_name)
-        coll = scene.collection.children.get(props.coll_name)
-        found = False
-        for ob in coll.objects:
-            if (ob.keys() and ob.get(props.base_name) and 
-                (ob[props.base_name] == item.uid) and 
-                (ob.type == 'MESH') and (ob is not t)):  
-                found = True
-                break
-        if found:
-            layout.prop(item, 'name', text = '', emboss = False, 
-                        icon = 'DRIVER_DISTANCE')
+        st = status.status_get(scene, scene.ptmc_props, data)
+        if item.uid in st['present']:
+            if item.previewed:
+                icon = 'SHADING_WIRE'
+            elif item.frozen:
+                icon = 'FREEZE'
+            else:
+                icon = 'DRIVER_DISTANCE'
+            layout.prop(item, 'name', text = '', emboss = False, icon = icon)
+        else:
+            layout.label(text = item.name, icon = 'QUESTION')
+
+class MCUTTER_UL_sessions(bpy.types.UIList):
+    """UI List [ sessions ]"""
+    def draw_item(self, context, layout, data, item, icon, active_data, 
+                    active_propname, index):
+        self.use_filter_show = False
+        scene = context.scene
+        if status.status_get(scene, scene.ptmc_props, item)['target_ok']:
+            layout.label(text = item.target_name, icon = 'MESH_DATA')
         else:
             layout.label(text = item.name, icon = 'QUESTION')
 # ------------------------------------------------------------------------------
@@ -254,10 +435,10 @@ class MCUTTER_UL_lst(bpy.types.UIList):
 #    UI PANEL
 # ------------------------------------------------------------------------------
 def state_active(scene, props):
-    t = scene.objects.get(props.target_name)
-    t_ok = (t is not None) and (t.type == 'MESH')
-    c_ok = scene.collection.children.get(props.coll_name)
-    return t_ok and c_ok and props.ul_coll
+    session = session_get(props)
+    if session is None:
+        return False
+    return status.status_get(scene, props, session)['valid']
 
 class MCUTTER_PT_ui:
     bl_space_type = "VIEW_3D"   
@@ -268,16 +449,16 @@ class MCUTTER_PT_ui:
 class MCUTTER_PT_ui_start(MCUTTER_PT_ui, bpy.types.Panel):
     bl_label = "MCutter 0.1.6"
 
-    @classmethod
-    def poll(cls, context):
-        return not state_active(context.scene, context.scene.ptmc_props)
-
     def draw(self, context):
         props = context.scene.ptmc_props
         ctx_ob = context.object 
         check_ok = ((ctx_ob is not None) and (ctx_ob.type == 'MESH') and 
                     (len(ctx_ob.data.polygons) > 0))
         layout = self.layout
+        if props.sessions:
+            row = layout.row()
+            row.template_list("MCUTTER_UL_sessions", "", props, "sessions", 
+                                props, "session_idx", rows = 2, maxrows = 4)
         row = layout.row()
         row.alignment = 'CENTER'
         row.label(text = f'Source:  {ctx_ob.name}' if check_ok else 
@@ -287,10 +468,15 @@ class MCUTTER_PT_ui_start(MCUTTER_PT_ui, bpy.types.Panel):
         row = col.row(align = True)
         row.prop(props, 'target_old_mods_remove')
         row.prop(props, 'target_apply_scale')
+        row = col.row(align = True)
+        row.prop(props, 'target_prep')
+        sub = row.row(align = True)
+        sub.enabled = props.target_prep
+        sub.prop(props, 'target_prep_dist')
         col.operator('mcutter.target_set')
 
 class MCUTTER_PT_ui_main(MCUTTER_PT_ui, bpy.types.Panel):
-    bl_label = "MCutter 0.1.6"
+    bl_label = "Current Session"
 
     @classmethod
     def poll(cls, context):
@@ -304,16 +490,20 @@ class MCUTTER_PT_ui_display(MCUTTER_PT_ui, bpy.types.Panel):
     bl_parent_id = "MCUTTER_PT_ui_main"
 
     def draw(self, context):
-        props = context.scene.ptmc_props
+        session = session_get(context.scene.ptmc_props)
         layout = self.layout
         col = layout.column(align = True)
         row = col.row()         
-        row.prop(props, 'target_bool_effects')
-        row.prop(props, 'target_wire')
+        row.prop(session, 'target_bool_effects')
+        row.prop(session, 'target_wire')
         row = col.row()
-        row.operator('mcutter.show_target', text = f'Show  {props.target_name}')
+        row.operator('mcutter.show_target', 
+                        text = f'Show  {session.target_name}')
         row = col.row()
         row.operator('mcutter.hide_cutters')
+        if session.prep_info:
+            row = col.row()
+            row.label(text = f'Cleaned: {session.prep_info}')
         
 class MCUTTER_PT_ui_stack(MCUTTER_PT_ui, bpy.types.Panel):
     bl_label = "Cutter stack"
@@ -321,17 +511,33 @@ class MCUTTER_PT_ui_stack(MCUTTER_PT_ui, bpy.types.Panel):
 
     def draw(self, context):
         props = context.scene.ptmc_props
+        session = session_get(props)
         layout = self.layout
         col = layout.column(align = True)
         row = col.row()
-        row.template_list("MCUTTER_UL_lst", "", props, "ul_coll", props, 
+        row.template_list("MCUTTER_UL_lst", "", session, "ul_coll", session, 
                             "ul_idx", rows = 2, maxrows = 3)
+        sub = row.column(align = True)
+        sub.operator('mcutter.move_item', text = '', 
+                        icon = 'TRIA_UP').direction = 'UP'
+        sub.operator('mcutter.move_item', text = '', 
+                        icon = 'TRIA_DOWN').direction = 'DOWN'
         box = layout.box()
         row = box.row(align = True)
         row.operator('mcutter.add_item', text = 'Add')
         row.operator('mcutter.remove_item', text = 'Remove')
         row = box.row()
         row.prop(props, 'copy_setts')
+        row = box.row(align = True)
+        row.operator('mcutter.share_item', text = 'Share')
+        row.operator('mcutter.unshare_item', text = 'Unshare')
+        frozen = session.ul_coll and session.ul_coll[session.ul_idx].frozen
+        row = box.row()
+        row.operator('mcutter.freeze_item', 
+                        text = 'Unfreeze' if frozen else 'Freeze')
+        row = box.row(align = True)
+        row.prop(props, 'preview', toggle = True)
+        row.operator('mcutter.preview_commit', text = 'Commit')
         
         box = layout.box()
         row = box.row()
@@ -352,6 +558,9 @@ class MCUTTER_PT_ui_final(MCUTTER_PT_ui, bpy.types.Panel):
         col.operator('mcutter.restart')
         col = split.column()  
         col.operator('mcutter.finalize')
+        row = layout.row(align = True)
+        row.operator('mcutter.memory_report')
+        row.operator('mcutter.purge_orphans')
 
 class MCUTTER_PT_ui_info(MCUTTER_PT_ui, bpy.types.Panel):
     bl_label = "Cutter summary"
@@ -360,7 +569,8 @@ class MCUTTER_PT_ui_info(MCUTTER_PT_ui, bpy.types.Panel):
     def draw(self, context):
         scene = context.scene
         props = scene.ptmc_props
-        ul_item = props.ul_coll[props.ul_idx]
+        session = session_get(props)
+        ul_item = session.ul_coll[session.ul_idx]
         layout = self.layout
         box = layout.box()
         col = box.column(align = True)
@@ -369,16 +579,18 @@ class MCUTTER_PT_ui_info(MCUTTER_PT_ui, bpy.types.Panel):
         row = col.row(align = True)
         row.label(text = f'boolean op: {ul_item.cutter_bool_op}')
         row = col.row(align = True)
+        row.label(text = f'solver: {ul_item.cutter_solver}')
+        row = col.row(align = True)
         row.label(text = f'use frame: {ul_item.frame}')
         row = col.row(align = True)
         row.label(text = f'radial array: {ul_item.radial}')
-        amod = False
-        for mod in ul_item.arr_coll:
-            if mod.count > 1:
-                amod = True
-                break
+        amod = ul_item.uid in status.status_get(scene, props, session)['arrays']
         row = col.row(align = True)
         row.label(text = f'modifier array: {amod}')
+        if ul_item.links:
+            row = col.row(align = True)
+            row.label(text = 'shared: ' + 
+                        ', '.join(link.name for link in ul_item.links))
 # ------------------------------------------------------------------------------
 #
 # ------------------------------------------------------------------------------
@@ -386,9 +598,13 @@ class MCUTTER_PT_ui_info(MCUTTER_PT_ui, bpy.types.Panel):
 # ------------------------------------------------------------------------------
 classes = (
     CUT_array,
+    CUT_link,
     UIL_item,
+    MCUTTER_session,
     MCUTTER_properties,
+    MCUTTER_preferences,
     MCUTTER_UL_lst,
+    MCUTTER_UL_sessions,
     MCUTTER_PT_ui_start,
     MCUTTER_PT_ui_main,
     MCUTTER_PT_ui_display,
@@ -404,6 +620,7 @@ def register():
                                                             MCUTTER_properties)
 
 def unregister():
+    status.unregister()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.ptmc_props
\ No newline at end of file
@@ -0,0 +1,123 @@
+
+###############################################################################
+##                                                                           ##
+##   MCutter add-on for Blender 2.83    Copyright (C) 2020  Pan Thistle      ##
+##                                                                           ##
+##   This program is free software: you can redistribute it and/or modify    ##
+##   it under the terms of the GNU General Public License as published by    ##
+##   the Free Software Foundation, either version 3 of the License, or       ##
+##   (at your option) any later version.                                     ##
+##                                                                           ##
+##   This program is distributed in the hope that it will be useful,         ##
+##   but WITHOUT ANY WARRANTY; without even the implied warranty of          ##
+##   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ##
+##   GNU General Public License for more details.                            ##
+##                                                                           ##
+##   You should have received a copy of the GNU General Public License       ##
+##   along with this program.  If not, see <https://www.gnu.org/licenses/>.  ##
+##                                                                           ##
+###############################################################################
+
+
+# ------------------------------------------------------------------------------
+#    IMPORTS
+# ------------------------------------------------------------------------------
+import numpy as np
+
+DIST = 1e-5
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    MESH ARRAYS
+# ------------------------------------------------------------------------------
+def mesh_coords(me):
+    co = np.empty(len(me.vertices) * 3, dtype = np.float64)
+    me.vertices.foreach_get('co', co)
+    return co.reshape(-1, 3)
+
+def mesh_areas(me):
+    area = np.empty(len(me.polygons), dtype = np.float64)
+    me.polygons.foreach_get('area', area)
+    return area
+
+def mesh_faces(me):
+    n = len(me.polygons)
+    starts = np.empty(n, dtype = np.int64)
+    totals = np.empty(n, dtype = np.int64)
+    loops = np.empty(len(me.loops), dtype = np.int64)
+    me.polygons.foreach_get('loop_start', starts)
+    me.polygons.foreach_get('loop_total', totals)
+    me.loops.foreach_get('vertex_index', loops)
+    return [loops[s:s + t] for s, t in zip(starts, totals)]
+
+def mesh_shells(me, steps):
+    # [(coords, faces)] per radial copy, faces re-indexed to the copy
+    co = mesh_coords(me)
+    faces = mesh_faces(me)
+    if steps < 2 or len(co) % steps or len(faces) % steps:
+        return [(co, faces)]
+    nv = len(co) // steps
+    nf = len(faces) // steps
+    return [(co[i * nv:(i + 1) * nv], 
+            [f - i * nv for f in faces[i * nf:(i + 1) * nf]]) 
+            for i in range(steps)]
+# ------------------------------------------------------------------------------
+#
+# ------------------------------------------------------------------------------
+#    CHECKS [ radial copies are equal-sized, contiguous vertex blocks ]
+# ------------------------------------------------------------------------------
+def shells_split(co, steps):
+    if steps < 2 or len(co) % steps:
+        return co.reshape(1, -1, 3)
+    return co.reshape(steps, -1, 3)
+
+def coincident_count(shells, dist):
+    count = 0
+    for shell in shells:
+        q = np.round(shell / dist).astype(np.int64)
+        count += len(q) - len(np.unique(q, axis = 0))
+    return count
+
+def shells_duplicate(shells, dist):
+    seen = set()
+    dup = []
+    for i, shell in enumerate(shells):
+        key = np.unique(np.round(shell / dist).astype(np.int64),
+                        axis = 0).tobytes()
+        if key in seen:
+            dup.append(i)
+        else:
+            seen.add(key)
+    return dup
+
+def shells_stacked(shells, dist):
+    # copies sharing one centre overlap completely (zero radius/offset)
+    if len(shells) < 2:
+        return 0
+    centres = shells.mean(axis = 1)
+    d = np.linalg.norm(centres[:, None, :] - centres[None, :, :], axis = 2)
+    return int((d[np.triu_indices(len(centres), 1)] < dist).sum())
+
+def mesh_check(me, steps, dist):
+    co = mesh_coords(me)
+    shells = shells_split(co, steps)
+    dup = shells_duplicate(shells, dist)
+    return {
+        'degenerate': int((mesh_areas(me) <= dist * dist).sum()),
+        'coincident': coincident_count(shells, dist),
+        'duplicate': dup,
+        'stacked': shells_stacked(np.delete(shells, dup, axis = 0), dist),
+        'shell_size': shells.shape[1]
+        }
+
+def check_message(result):
+    msg = []
+    if result['degenerate']:
+        msg.append(f"{result['degenerate']} zero-area faces")
+    if result['coincident']:
+        msg.append(f"{result['coincident']} coincident verts")
+    if result['duplicate']:
+        msg.append(f"{len(result['duplicate'])} duplicate radial copies")
+    if result['stacked']:
+        msg.append(f"{result['stacked']} stacked radial copies")
+    return ', '.join(msg)